@@ -1,575 +1,508 @@
-import random
-import tkinter as tk
-from tkinter import scrolledtext
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import os
-import time
-import re  # Ajout pour l'extraction robuste des numéros
-
-def generate_machines(n_physiques, vm_min, vm_max, step, n_scenarios):
-    machines_physiques = []
-    machines_virtuelles_list = [[] for _ in range(n_scenarios)]
-    
-    for i in range(n_physiques):
-        machines_physiques.append([f"PM_{i+1}", random.randint(16, 32), random.randint(32, 128), random.randint(500, 1000)])
-    
-    for idx in range(n_scenarios):
-        n_virt = random.randrange(vm_min, vm_max + 1, step)
-        for i in range(n_virt):
-            arrival = random.randint(0, 1440)
-            departure = random.randint(arrival, 1440)
-            machines_virtuelles_list[idx].append([f"VM_{idx+1}_{i+1}", random.randint(1, 8), random.randint(1, 32), random.randint(10, 200), arrival, departure])
-    
-    return machines_physiques, machines_virtuelles_list
-
-def save_to_txt(filename, machines):
-    with open(filename, mode='w') as file:
-        for machine in machines:
-            file.write(" ".join(map(str, machine)) + "\n")
-
-def read_from_txt(filename, is_vm=False):
-    machines = []
-    with open(filename, mode='r') as file:
-        for line in file:
-            parts = line.strip().split()
-            if is_vm:
-                machines.append([parts[0], int(parts[1]), int(parts[2]), int(parts[3]), int(parts[4]), int(parts[5])])
-            else:
-                machines.append([parts[0], int(parts[1]), int(parts[2]), int(parts[3])])
-    return machines
-
-def is_feasible(pm, vm, assigned_vms):
-    remaining_cpu = pm[1]
-    remaining_ram = pm[2]
-    remaining_storage = pm[3]
-    
-    for assigned_vm in assigned_vms:
-        if vm[4] < assigned_vm[5] and vm[5] > assigned_vm[4]:
-            remaining_cpu -= assigned_vm[1]
-            remaining_ram -= assigned_vm[2]
-            remaining_storage -= assigned_vm[3]
-    
-    return remaining_cpu >= vm[1] and remaining_ram >= vm[2] and remaining_storage >= vm[3]
-
-def initial_placement(vms, pms):
-    placement = {pm[0]: [] for pm in pms}
-    unplaced_vms = []
-    
-    vms.sort(key=lambda x: x[4])
-    
-    for vm in vms:
-        placed = False
-        for pm in pms:
-            if is_feasible(pm, vm, placement[pm[0]]):
-                placement[pm[0]].append(vm)
-                placed = True
-                break
-        if not placed:
-            unplaced_vms.append(vm)
-    
-    return placement, unplaced_vms
-
-def evaluate(placement):
-    return sum(len(vms) for vms in placement.values())
-
-def tabu_search(vms, pms, iterations=100, tabu_size=10):
-    best_solution, unplaced_vms = initial_placement(vms, pms)
-    best_score = evaluate(best_solution)
-    tabu_list = []
-    
-    for _ in range(iterations):
-        neighbors = []
-        
-        for vm in vms:
-            if any(vm[0] in [v[0] for v in vms_list] for vms_list in best_solution.values()):
-                continue
-            
-            for pm in pms:
-                new_solution = {key: value[:] for key, value in best_solution.items()}
-                if is_feasible(pm, vm, new_solution[pm[0]]):
-                    new_solution[pm[0]].append(vm)
-                    if new_solution not in tabu_list:
-                        neighbors.append((new_solution, evaluate(new_solution)))
-        
-        if not neighbors:
-            continue
-        
-        best_neighbor = max(neighbors, key=lambda x: x[1])
-        
-        if best_neighbor[1] > best_score:
-            best_solution, best_score = best_neighbor
-            tabu_list.append(best_solution)
-            if len(tabu_list) > tabu_size:
-                tabu_list.pop(0)
-    
-    final_unplaced_vms = [vm for vm in vms if all(vm[0] not in [v[0] for v in vms_list] for vms_list in best_solution.values())]
-    return best_solution, final_unplaced_vms, best_score
-
-def calculate_resource_usage(placement, pms):
-    resource_usage = {}
-    for pm in pms:
-        pm_name = pm[0]
-        vms = placement[pm_name]
-        
-        timeline = []
-        for vm in vms:
-            timeline.append((vm[4], 'start', vm[1], vm[2], vm[3]))
-            timeline.append((vm[5], 'end', vm[1], vm[2], vm[3]))
-        
-        timeline.sort(key=lambda x: x[0])
-        
-        max_cpu = pm[1]
-        max_ram = pm[2]
-        max_storage = pm[3]
-        
-        current_cpu = 0
-        current_ram = 0
-        current_storage = 0
-        max_observed_cpu = 0
-        max_observed_ram = 0
-        max_observed_storage = 0
-        
-        for event in timeline:
-            time, typ, cpu, ram, storage = event
-            if typ == 'start':
-                current_cpu += cpu
-                current_ram += ram
-                current_storage += storage
-            else:
-                current_cpu -= cpu
-                current_ram -= ram
-                current_storage -= storage
-            
-            max_observed_cpu = max(max_observed_cpu, current_cpu)
-            max_observed_ram = max(max_observed_ram, current_ram)
-            max_observed_storage = max(max_observed_storage, current_storage)
-        
-        cpu_percent = min((max_observed_cpu / max_cpu) * 100, 100) if max_cpu > 0 else 0
-        ram_percent = min((max_observed_ram / max_ram) * 100, 100) if max_ram > 0 else 0
-        storage_percent = min((max_observed_storage / max_storage) * 100, 100) if max_storage > 0 else 0
-        
-        resource_usage[pm_name] = {
-            'cpu': cpu_percent,
-            'ram': ram_percent,
-            'storage': storage_percent,
-            'vms': [vm[0] for vm in vms],
-            'max_cpu': max_cpu,
-            'max_ram': max_ram,
-            'max_storage': max_storage,
-            'used_cpu': max_observed_cpu,
-            'used_ram': max_observed_ram,
-            'used_storage': max_observed_storage
-        }
-    
-    return resource_usage
-
-def create_graph_window(fig, title):
-    graph_window = tk.Toplevel(root)
-    graph_window.title(title)
-    
-    canvas = FigureCanvasTkAgg(fig, master=graph_window)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-    
-    close_button = tk.Button(graph_window, text="Fermer", command=graph_window.destroy)
-    close_button.pack()
-
-def plot_cpu_usage(pm_names, cpu_usage, resource_usage, pms, scenario_num):
-    fig = plt.figure(figsize=(8, 5))
-    plt.title(f"Scénario {scenario_num} - Utilisation du CPU", fontsize=14)
-    bars_usage = plt.bar(pm_names, cpu_usage, color='skyblue', label='Utilisation')
-    bars_capacity = plt.bar(pm_names, [100]*len(pm_names), color='none', edgecolor='gray', linewidth=2, alpha=0.5, label='Capacité max')
-    plt.ylabel('CPU (%)')
-    plt.legend()
-    for bar, usage, pm in zip(bars_usage, cpu_usage, pms):
-        usage_text = f"{usage:.1f}%\n({resource_usage[pm[0]]['used_cpu']}/{pm[1]})"
-        plt.text(bar.get_x() + bar.get_width()/2, min(usage, 100)/2, 
-                usage_text, ha='center', va='center', color='black')
-    plt.tight_layout()
-    create_graph_window(fig, f"CPU - Scénario {scenario_num}")
-
-def plot_ram_usage(pm_names, ram_usage, resource_usage, pms, scenario_num):
-    fig = plt.figure(figsize=(8, 5))
-    plt.title(f"Scénario {scenario_num} - Utilisation de la RAM", fontsize=14)
-    bars_usage = plt.bar(pm_names, ram_usage, color='lightgreen', label='Utilisation')
-    bars_capacity = plt.bar(pm_names, [100]*len(pm_names), color='none', edgecolor='gray', linewidth=2, alpha=0.5, label='Capacité max')
-    plt.ylabel('RAM (%)')
-    plt.legend()
-    for bar, usage, pm in zip(bars_usage, ram_usage, pms):
-        usage_text = f"{usage:.1f}%\n({resource_usage[pm[0]]['used_ram']}/{pm[2]})"
-        plt.text(bar.get_x() + bar.get_width()/2, min(usage, 100)/2, 
-                usage_text, ha='center', va='center', color='black')
-    plt.tight_layout()
-    create_graph_window(fig, f"RAM - Scénario {scenario_num}")
-
-def plot_storage_usage(pm_names, storage_usage, resource_usage, pms, scenario_num):
-    fig = plt.figure(figsize=(8, 5))
-    plt.title(f"Scénario {scenario_num} - Utilisation du Stockage", fontsize=14)
-    bars_usage = plt.bar(pm_names, storage_usage, color='salmon', label='Utilisation')
-    bars_capacity = plt.bar(pm_names, [100]*len(pm_names), color='none', edgecolor='gray', linewidth=2, alpha=0.5, label='Capacité max')
-    plt.ylabel('Stockage (%)')
-    plt.legend()
-    for bar, usage, pm in zip(bars_usage, storage_usage, pms):
-        usage_text = f"{usage:.1f}%\n({resource_usage[pm[0]]['used_storage']}/{pm[3]})"
-        plt.text(bar.get_x() + bar.get_width()/2, min(usage, 100)/2, 
-                usage_text, ha='center', va='center', color='black')
-    plt.tight_layout()
-    create_graph_window(fig, f"Stockage - Scénario {scenario_num}")
-
-def plot_vm_counts(pm_names, vm_counts, scenario_num):
-    fig = plt.figure(figsize=(8, 5))
-    plt.title(f"Scénario {scenario_num} - Nombre de VMs", fontsize=14)
-    plt.plot(pm_names, vm_counts, 'o-', color='purple')
-    plt.ylabel('Nombre de VMs')
-    for x, y in zip(pm_names, vm_counts):
-        plt.text(x, y, str(y), ha='center', va='bottom')
-    plt.tight_layout()
-    create_graph_window(fig, f"VMs - Scénario {scenario_num}")
-
-def plot_resource_usage(placement, pms, scenario_num):
-    if not placement:
-        return
-    
-    plt.close('all')
-    
-    pm_names = [pm[0] for pm in pms]
-    cpu_usage = []
-    ram_usage = []
-    storage_usage = []
-    vm_counts = []
-    
-    resource_usage = calculate_resource_usage(placement, pms)
-    
-    for pm in pms:
-        pm_name = pm[0]
-        usage = resource_usage[pm_name]
-        cpu_usage.append(usage['cpu'])
-        ram_usage.append(usage['ram'])
-        storage_usage.append(usage['storage'])
-        vm_counts.append(len(usage['vms']))
-    
-    plot_cpu_usage(pm_names, cpu_usage, resource_usage, pms, scenario_num)
-    plot_ram_usage(pm_names, ram_usage, resource_usage, pms, scenario_num)
-    plot_storage_usage(pm_names, storage_usage, resource_usage, pms, scenario_num)
-    plot_vm_counts(pm_names, vm_counts, scenario_num)
-
-def plot_rejection_rates(rejection_rates):
-    if not rejection_rates:
-        return
-    
-    plt.close('all')
-    
-    fig = plt.figure(figsize=(10, 6))
-    plt.title("Taux de rejet par scénario", fontsize=16)
-    
-    scenarios = range(1, len(rejection_rates)+1)
-    plt.bar(scenarios, rejection_rates, color='red', alpha=0.7)
-    
-    for i, rate in enumerate(rejection_rates):
-        plt.text(i+1, rate+1, f"{rate:.1f}%", ha='center')
-    
-    plt.xlabel("Scénario")
-    plt.ylabel("Taux de rejet (%)")
-    plt.xticks(scenarios)
-    plt.ylim(0, 100)
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    
-    avg_rejection = sum(rejection_rates) / len(rejection_rates)
-    plt.axhline(y=avg_rejection, color='blue', linestyle='--', label=f"Moyenne: {avg_rejection:.1f}%")
-    plt.legend()
-    
-    create_graph_window(fig, "Taux de rejet par scénario")
-
-def on_submit():
-    try:
-        submit_button.config(state=tk.DISABLED)
-        load_button.config(state=tk.DISABLED)
-        
-        n_physiques = int(entry_n_physiques.get())
-        vm_min = int(entry_vm_min.get())
-        vm_max = int(entry_vm_max.get())
-        step = int(entry_step.get())
-        n_scenarios = int(entry_n_scenarios.get())
-        
-        if vm_min > vm_max:
-            result_text.delete(1.0, tk.END)
-            result_text.insert(tk.END, "Erreur: Le minimum ne peut pas être supérieur au maximum.\n")
-            submit_button.config(state=tk.NORMAL)
-            load_button.config(state=tk.NORMAL)
-            return
-        if step <= 0:
-            result_text.delete(1.0, tk.END)
-            result_text.insert(tk.END, "Erreur: Le pas doit être un entier positif.\n")
-            submit_button.config(state=tk.NORMAL)
-            load_button.config(state=tk.NORMAL)
-            return
-        
-        result_text.delete(1.0, tk.END)
-        result_text.insert(tk.END, "Génération des scénarios en cours...\n")
-        root.update_idletasks()
-        
-        timestamp = int(time.time())
-        scenario_folder = f"scenarios_{timestamp}"
-        os.makedirs(scenario_folder, exist_ok=True)
-        
-        pms, vms_list = generate_machines(n_physiques, vm_min, vm_max, step, n_scenarios)
-        save_to_txt(f"{scenario_folder}/machines_physiques.txt", pms)
-        
-        rejection_rates = []
-        avg_cpu_usage = []
-        avg_ram_usage = []
-        avg_storage_usage = []
-        
-        for idx, vms in enumerate(vms_list, start=1):  # Modification ici: start=1
-            if not root.winfo_exists():
-                return
-                
-            filename = f"{scenario_folder}/machines_virtuelles_{idx}.txt"
-            save_to_txt(filename, vms)
-            
-            result_text.insert(tk.END, f"\n=== Scénario {idx} ===\n")
-            result_text.insert(tk.END, f"Nombre de VMs générées: {len(vms)}\n")
-            root.update_idletasks()
-            
-            vms_from_file = read_from_txt(filename, is_vm=True)
-            best_solution, unplaced_vms, best_score = tabu_search(vms_from_file, pms)
-            
-            total_vms = len(vms_from_file)
-            rejected_vms = len(unplaced_vms)
-            rejection_rate = (rejected_vms / total_vms) * 100 if total_vms > 0 else 0
-            rejection_rates.append(rejection_rate)
-            
-            resource_usage = calculate_resource_usage(best_solution, pms)
-            
-            scenario_cpu = []
-            scenario_ram = []
-            scenario_storage = []
-            
-            result_text.insert(tk.END, "\nDétail des PMs:\n")
-            for pm in pms:
-                if not root.winfo_exists():
-                    return
-                    
-                pm_name = pm[0]
-                usage = resource_usage.get(pm_name, {'cpu': 0, 'ram': 0, 'storage': 0, 'vms': []})
-                
-                scenario_cpu.append(usage['cpu'])
-                scenario_ram.append(usage['ram'])
-                scenario_storage.append(usage['storage'])
-                
-                result_text.insert(tk.END, f"\n{pm_name}:\n")
-                result_text.insert(tk.END, f"- CPU utilisé: {usage['cpu']:.2f}% ({usage['used_cpu']}/{pm[1]})\n")
-                result_text.insert(tk.END, f"- RAM utilisée: {usage['ram']:.2f}% ({usage['used_ram']}/{pm[2]})\n")
-                result_text.insert(tk.END, f"- Stockage utilisé: {usage['storage']:.2f}% ({usage['used_storage']}/{pm[3]})\n")
-                result_text.insert(tk.END, f"- VMs placées: {', '.join(usage['vms']) if usage['vms'] else 'Aucune'}\n")
-                root.update_idletasks()
-            
-            avg_cpu = sum(scenario_cpu) / len(scenario_cpu) if scenario_cpu else 0
-            avg_ram = sum(scenario_ram) / len(scenario_ram) if scenario_ram else 0
-            avg_storage = sum(scenario_storage) / len(scenario_storage) if scenario_storage else 0
-            
-            avg_cpu_usage.append(avg_cpu)
-            avg_ram_usage.append(avg_ram)
-            avg_storage_usage.append(avg_storage)
-            
-            result_text.insert(tk.END, f"\nRésumé pour le scénario {idx}:\n")
-            result_text.insert(tk.END, f"- Nombre de VMs placées: {best_score}\n")
-            result_text.insert(tk.END, f"- Nombre de VMs rejetées: {rejected_vms}\n")
-            result_text.insert(tk.END, f"- Taux de rejet: {rejection_rate:.2f}%\n")
-            result_text.insert(tk.END, f"- CPU moyen utilisé: {avg_cpu:.2f}%\n")
-            result_text.insert(tk.END, f"- RAM moyenne utilisée: {avg_ram:.2f}%\n")
-            result_text.insert(tk.END, f"- Stockage moyen utilisé: {avg_storage:.2f}%\n")
-            root.update_idletasks()
-            
-            plot_resource_usage(best_solution, pms, idx)
-        
-        if rejection_rates and root.winfo_exists():
-            avg_rejection = sum(rejection_rates) / len(rejection_rates)
-            global_avg_cpu = sum(avg_cpu_usage) / len(avg_cpu_usage)
-            global_avg_ram = sum(avg_ram_usage) / len(avg_ram_usage)
-            global_avg_storage = sum(avg_storage_usage) / len(avg_storage_usage)
-            
-            result_text.insert(tk.END, "\n=== Résultats globaux ===\n")
-            result_text.insert(tk.END, f"Taux de rejet moyen: {avg_rejection:.2f}%\n")
-            result_text.insert(tk.END, f"CPU moyen utilisé: {global_avg_cpu:.2f}%\n")
-            result_text.insert(tk.END, f"RAM moyenne utilisée: {global_avg_ram:.2f}%\n")
-            result_text.insert(tk.END, f"Stockage moyen utilisé: {global_avg_storage:.2f}%\n")
-            
-            plot_rejection_rates(rejection_rates)
-        
-    except Exception as e:
-        if root.winfo_exists():
-            result_text.delete(1.0, tk.END)
-            result_text.insert(tk.END, f"Erreur: {str(e)}\n")
-    finally:
-        if root.winfo_exists():
-            submit_button.config(state=tk.NORMAL)
-            load_button.config(state=tk.NORMAL)
-
-def load_existing_scenarios():
-    try:
-        submit_button.config(state=tk.DISABLED)
-        load_button.config(state=tk.DISABLED)
-        
-        result_text.delete(1.0, tk.END)
-        result_text.insert(tk.END, "Chargement des scénarios existants...\n")
-        root.update_idletasks()
-        
-        if not os.path.exists("machines_physiques.txt"):
-            result_text.insert(tk.END, "Erreur: Fichier machines_physiques.txt introuvable\n")
-            return
-            
-        pms = read_from_txt("machines_physiques.txt", is_vm=False)
-        
-        rejection_rates = []
-        avg_cpu_usage = []
-        avg_ram_usage = []
-        avg_storage_usage = []
-        
-        # Nouvelle méthode robuste pour détecter et trier les fichiers
-        vm_files = []
-        for f in os.listdir():
-            match = re.match(r'machines_virtuelles_(\d+)\.txt', f)
-            if match:
-                try:
-                    num = int(match.group(1))
-                    vm_files.append((num, f))
-                except:
-                    continue
-        
-        # Tri par numéro de scénario en ordre croissant
-        vm_files.sort(key=lambda x: x[0])
-        
-        for num, vm_file in vm_files:
-            if not root.winfo_exists():
-                return
-                
-            result_text.insert(tk.END, f"\n=== Scénario {num} ===\n")
-            
-            vms_from_file = read_from_txt(vm_file, is_vm=True)
-            result_text.insert(tk.END, f"Nombre de VMs chargées: {len(vms_from_file)}\n")
-            root.update_idletasks()
-            
-            best_solution, unplaced_vms, best_score = tabu_search(vms_from_file, pms)
-            
-            total_vms = len(vms_from_file)
-            rejected_vms = len(unplaced_vms)
-            rejection_rate = (rejected_vms / total_vms) * 100 if total_vms > 0 else 0
-            rejection_rates.append(rejection_rate)
-            
-            resource_usage = calculate_resource_usage(best_solution, pms)
-            
-            scenario_cpu = []
-            scenario_ram = []
-            scenario_storage = []
-            
-            result_text.insert(tk.END, "\nDétail des PMs:\n")
-            for pm in pms:
-                if not root.winfo_exists():
-                    return
-                    
-                pm_name = pm[0]
-                usage = resource_usage.get(pm_name, {'cpu': 0, 'ram': 0, 'storage': 0, 'vms': []})
-                
-                scenario_cpu.append(usage['cpu'])
-                scenario_ram.append(usage['ram'])
-                scenario_storage.append(usage['storage'])
-                
-                result_text.insert(tk.END, f"\n{pm_name}:\n")
-                result_text.insert(tk.END, f"- CPU utilisé: {usage['cpu']:.2f}% ({usage['used_cpu']}/{pm[1]})\n")
-                result_text.insert(tk.END, f"- RAM utilisée: {usage['ram']:.2f}% ({usage['used_ram']}/{pm[2]})\n")
-                result_text.insert(tk.END, f"- Stockage utilisé: {usage['storage']:.2f}% ({usage['used_storage']}/{pm[3]})\n")
-                result_text.insert(tk.END, f"- VMs placées: {', '.join(usage['vms']) if usage['vms'] else 'Aucune'}\n")
-                root.update_idletasks()
-            
-            avg_cpu = sum(scenario_cpu) / len(scenario_cpu) if scenario_cpu else 0
-            avg_ram = sum(scenario_ram) / len(scenario_ram) if scenario_ram else 0
-            avg_storage = sum(scenario_storage) / len(scenario_storage) if scenario_storage else 0
-            
-            avg_cpu_usage.append(avg_cpu)
-            avg_ram_usage.append(avg_ram)
-            avg_storage_usage.append(avg_storage)
-            
-            result_text.insert(tk.END, f"\nRésumé pour le scénario {num}:\n")
-            result_text.insert(tk.END, f"- Nombre de VMs placées: {best_score}\n")
-            result_text.insert(tk.END, f"- Nombre de VMs rejetées: {rejected_vms}\n")
-            result_text.insert(tk.END, f"- Taux de rejet: {rejection_rate:.2f}%\n")
-            result_text.insert(tk.END, f"- CPU moyen utilisé: {avg_cpu:.2f}%\n")
-            result_text.insert(tk.END, f"- RAM moyenne utilisée: {avg_ram:.2f}%\n")
-            result_text.insert(tk.END, f"- Stockage moyen utilisé: {avg_storage:.2f}%\n")
-            root.update_idletasks()
-            
-            plot_resource_usage(best_solution, pms, num)
-        
-        if rejection_rates and root.winfo_exists():
-            avg_rejection = sum(rejection_rates) / len(rejection_rates)
-            global_avg_cpu = sum(avg_cpu_usage) / len(avg_cpu_usage)
-            global_avg_ram = sum(avg_ram_usage) / len(avg_ram_usage)
-            global_avg_storage = sum(avg_storage_usage) / len(avg_storage_usage)
-            
-            result_text.insert(tk.END, "\n=== Résultats globaux ===\n")
-            result_text.insert(tk.END, f"Taux de rejet moyen: {avg_rejection:.2f}%\n")
-            result_text.insert(tk.END, f"CPU moyen utilisé: {global_avg_cpu:.2f}%\n")
-            result_text.insert(tk.END, f"RAM moyenne utilisée: {global_avg_ram:.2f}%\n")
-            result_text.insert(tk.END, f"Stockage moyen utilisé: {global_avg_storage:.2f}%\n")
-            
-            plot_rejection_rates(rejection_rates)
-        
-    except Exception as e:
-        if root.winfo_exists():
-            result_text.delete(1.0, tk.END)
-            result_text.insert(tk.END, f"Erreur: {str(e)}\n")
-    finally:
-        if root.winfo_exists():
-            submit_button.config(state=tk.NORMAL)
-            load_button.config(state=tk.NORMAL)
-
-# Interface graphique
-root = tk.Tk()
-root.title("Placement de Machines Virtuelles - Optimisation")
-root.geometry("700x700")
-root.resizable(False, False)
-root.configure(bg='#ADD8E6')
-
-frame = tk.Frame(root, bg='#ADD8E6')
-frame.pack(padx=10, pady=10)
-
-for i in range(6):
-    frame.grid_rowconfigure(i, weight=1)
-frame.grid_columnconfigure(0, weight=1)
-frame.grid_columnconfigure(1, weight=1)
-
-tk.Label(frame, text="Nombre de machines physiques (PMs):", bg='#ADD8E6').grid(row=0, column=0, padx=10, pady=5, sticky='w')
-entry_n_physiques = tk.Entry(frame)
-entry_n_physiques.grid(row=0, column=1, padx=10, pady=5, sticky='ew')
-
-tk.Label(frame, text="Nombre minimum de VMs par scénario:", bg='#ADD8E6').grid(row=1, column=0, padx=10, pady=5, sticky='w')
-entry_vm_min = tk.Entry(frame)
-entry_vm_min.grid(row=1, column=1, padx=10, pady=5, sticky='ew')
-
-tk.Label(frame, text="Nombre maximum de VMs par scénario:", bg='#ADD8E6').grid(row=2, column=0, padx=10, pady=5, sticky='w')
-entry_vm_max = tk.Entry(frame)
-entry_vm_max.grid(row=2, column=1, padx=10, pady=5, sticky='ew')
-
-tk.Label(frame, text="Pas pour le nombre de VMs:", bg='#ADD8E6').grid(row=3, column=0, padx=10, pady=5, sticky='w')
-entry_step = tk.Entry(frame)
-entry_step.grid(row=3, column=1, padx=10, pady=5, sticky='ew')
-
-tk.Label(frame, text="Nombre de scénarios (fichiers VM):", bg='#ADD8E6').grid(row=4, column=0, padx=10, pady=5, sticky='w')
-entry_n_scenarios = tk.Entry(frame)
-entry_n_scenarios.grid(row=4, column=1, padx=10, pady=5, sticky='ew')
-
-submit_button = tk.Button(frame, text="Générer et Calculer", command=on_submit, bg="#1b019b", fg="white", width=20)
-submit_button.grid(row=5, column=0, columnspan=2, pady=10)
-
-load_button = tk.Button(frame, text="Charger scénarios existants", command=load_existing_scenarios, bg="#019b1d", fg="white", width=20)
-load_button.grid(row=6, column=0, columnspan=2, pady=10)
-
-result_frame = tk.Frame(root)
-result_frame.pack(padx=10, pady=(0,10), fill=tk.BOTH, expand=True)
-
-result_text = scrolledtext.ScrolledText(result_frame, width=80, height=25, bg='#f0f8ff', wrap=tk.WORD)
-result_text.pack(fill=tk.BOTH, expand=True)
-
-root.mainloop()
\ No newline at end of file
+import tkinter as tk
+from tkinter import filedialog, scrolledtext, ttk
+import base64
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from vmplacement import PM_FILENAME, ResultCache, generate_machines, global_summary, list_scenario_files, pm_file, read_machines, save_to_txt, solve_files, sorted_results
+
+# Tableau de bord des graphiques : une seule fenêtre, une page par scénario (plus le taux de rejet) et un graphique
+# affiché à la fois. Seul le graphique affiché est dessiné, hors écran (vmplacement.charts, Agg, sans pyplot),
+# dans le thread de rendu ; l'image PNG revient par la file events. Les images déjà dessinées sont gardées
+# (au plus MAX_IMAGES). matplotlib n'est importé qu'au premier rendu.
+CHART_DPI = 90
+MAX_IMAGES = 40
+REJECTION_PAGE = 'rejection'
+
+render_executor = ThreadPoolExecutor(max_workers=1)
+chart_results = {}  # numéro de scénario -> résultat
+chart_pms = None
+chart_rejections = None  # (taux de rejet, numéros de scénario), une fois tous les scénarios résolus
+chart_images = {}  # (génération, page, graphique) -> PhotoImage, du plus ancien au plus récent
+chart_pending = set()
+chart_generation = 0  # incrémentée à chaque calcul : les rendus d'un calcul précédent sont ignorés
+dashboard = {}
+
+def chart_pages():
+    pages = sorted(chart_results)
+    if chart_rejections is not None:
+        pages.append(REJECTION_PAGE)
+    return pages
+
+def page_label(page):
+    return "Taux de rejet" if page == REJECTION_PAGE else f"Scénario {page}"
+
+def dashboard_open():
+    return bool(dashboard) and dashboard['window'].winfo_exists()
+
+def open_dashboard():
+    from vmplacement.charts import SCENARIO_CHARTS
+    
+    if dashboard_open():
+        dashboard['window'].lift()
+        return
+    window = tk.Toplevel(root)
+    window.title("Graphiques")
+    window.geometry("920x620")
+    
+    bar = tk.Frame(window)
+    bar.pack(fill=tk.X, padx=5, pady=5)
+    tk.Button(bar, text="◀", command=lambda: step_page(-1)).pack(side=tk.LEFT)
+    page = ttk.Combobox(bar, state='readonly', width=18)
+    page.pack(side=tk.LEFT, padx=2)
+    page.bind("<<ComboboxSelected>>", lambda event: show_chart())
+    tk.Button(bar, text="▶", command=lambda: step_page(1)).pack(side=tk.LEFT)
+    kind = tk.StringVar(value='cpu')
+    kind_buttons = []
+    for key, label in SCENARIO_CHARTS.items():
+        button = ttk.Radiobutton(bar, text=label, value=key, variable=kind, command=show_chart)
+        button.pack(side=tk.LEFT, padx=4)
+        kind_buttons.append(button)
+    tk.Button(bar, text="Exporter PNG/SVG...", command=export_charts).pack(side=tk.RIGHT)
+    
+    image = tk.Label(window, text="Aucun résultat", bg='white')
+    image.pack(fill=tk.BOTH, expand=True)
+    dashboard.update(window=window, page=page, kind=kind, kind_buttons=kind_buttons, image=image)
+    refresh_pages()
+
+def refresh_pages():
+    if not dashboard_open():
+        return
+    page = dashboard['page']
+    pages = chart_pages()
+    page['values'] = [page_label(key) for key in pages]
+    if pages and page.current() < 0:
+        page.current(0)
+        show_chart()
+
+def current_page():
+    index = dashboard['page'].current()
+    pages = chart_pages()
+    return pages[index] if 0 <= index < len(pages) else None
+
+def step_page(delta):
+    pages = chart_pages()
+    if not pages:
+        return
+    index = min(max(dashboard['page'].current() + delta, 0), len(pages) - 1)
+    dashboard['page'].current(index)
+    show_chart()
+
+def render_chart(kind, data):
+    # Exécuté dans le thread de rendu
+    from vmplacement import charts
+    
+    if kind == REJECTION_PAGE:
+        fig = charts.rejection_figure(*data)
+    else:
+        fig = charts.scenario_figure(data[0], kind, data[1])
+    return charts.render(fig, 'png', CHART_DPI)
+
+def show_chart():
+    if not dashboard_open():
+        return
+    page = current_page()
+    if page is None:
+        return
+    kind = REJECTION_PAGE if page == REJECTION_PAGE else dashboard['kind'].get()
+    for button in dashboard['kind_buttons']:
+        button.config(state=tk.DISABLED if page == REJECTION_PAGE else tk.NORMAL)
+    
+    image_key = (chart_generation, page, kind)
+    photo = chart_images.pop(image_key, None)
+    if photo is not None:
+        chart_images[image_key] = photo
+        dashboard['image'].config(image=photo, text="")
+        return
+    dashboard['image'].config(image="", text="Rendu en cours...")
+    if image_key not in chart_pending:
+        chart_pending.add(image_key)
+        data = chart_rejections if page == REJECTION_PAGE else (chart_results[page], chart_pms)
+        future = render_executor.submit(render_chart, kind, data)
+        future.add_done_callback(lambda future: events.put(('chart', image_key, future)))
+
+def chart_rendered(image_key, future):
+    chart_pending.discard(image_key)
+    if image_key[0] != chart_generation:
+        return None
+    if future.exception() is not None:
+        return f"Erreur de rendu: {future.exception()}\n"
+    chart_images[image_key] = tk.PhotoImage(data=base64.b64encode(future.result()))
+    while len(chart_images) > MAX_IMAGES:
+        chart_images.pop(next(iter(chart_images)))
+    show_chart()
+    return None
+
+def export_charts():
+    # Export de tous les graphiques (PNG et SVG) dans le thread de rendu
+    if not chart_results:
+        return
+    folder = filedialog.askdirectory(parent=dashboard['window'], title="Dossier d'export des graphiques")
+    if not folder:
+        return
+    results = [chart_results[num] for num in sorted(chart_results)]
+    pms = chart_pms
+    
+    def job():
+        from vmplacement.charts import export_results
+        return export_results(results, folder, pms, ('png', 'svg'))
+    
+    def done(future):
+        if future.exception() is not None:
+            events.put(('log', f"\nErreur d'export: {future.exception()}\n"))
+        else:
+            events.put(('log', f"\n{len(future.result())} graphiques exportés dans {folder}\n"))
+    
+    render_executor.submit(job).add_done_callback(done)
+
+def add_chart_result(result, pms):
+    global chart_pms
+    chart_results[result['scenario']] = result
+    chart_pms = pms
+    if len(chart_results) == 1 and not dashboard_open():
+        open_dashboard()
+    else:
+        refresh_pages()
+
+def set_chart_rejections(rejection_rates, scenarios):
+    global chart_rejections
+    chart_rejections = (rejection_rates, scenarios)
+    refresh_pages()
+
+def reset_charts():
+    global chart_generation, chart_rejections, chart_pms
+    chart_generation += 1
+    chart_results.clear()
+    chart_images.clear()
+    chart_pending.clear()
+    chart_rejections = None
+    chart_pms = None
+    if dashboard_open():
+        dashboard['page'].set("")
+        dashboard['page']['values'] = []
+        dashboard['image'].config(image="", text="Aucun résultat")
+
+# Le calcul tourne dans un thread de travail (lui-même réparti sur un pool de processus).
+# L'interface ne fait que relever périodiquement deux files :
+# - events : messages du thread ('log', 'scenarios', 'result', 'global', 'error', 'done') et du rendu ('chart')
+# - progress_events : avancement publié par les processus de calcul ('progress', ...)
+POLL_INTERVAL = 100  # ms
+MAX_EVENTS_PER_POLL = 200
+
+events = queue.Queue()
+progress_events = None
+cancel_event = None
+progress_bars = {}
+
+def format_result(result, pms):
+    resource_usage = result['resource_usage']
+    lines = [f"\n=== Scénario {result['scenario']} ===", f"Nombre de VMs: {result['total_vms']}", "", "Détail des PMs:"]
+    for pm in pms:
+        pm_name = pm[0]
+        usage = resource_usage[pm_name]
+        lines.append(f"\n{pm_name}:")
+        lines.append(f"- CPU utilisé: {usage['cpu']:.2f}% ({usage['used_cpu']}/{pm[1]})")
+        lines.append(f"- RAM utilisée: {usage['ram']:.2f}% ({usage['used_ram']}/{pm[2]})")
+        lines.append(f"- Stockage utilisé: {usage['storage']:.2f}% ({usage['used_storage']}/{pm[3]})")
+        if 'twa_cpu' in usage:
+            lines.append(f"- Moyenne sur la journée: CPU {usage['twa_cpu']:.2f}%, RAM {usage['twa_ram']:.2f}%, Stockage {usage['twa_storage']:.2f}%")
+        lines.append(f"- VMs placées: {', '.join(usage['vms']) if usage['vms'] else 'Aucune'}")
+    
+    lines.append(f"\nRésumé pour le scénario {result['scenario']}:")
+    lines.append(f"- Nombre de VMs placées: {result['placed']}")
+    lines.append(f"- Nombre de VMs rejetées: {result['rejected']}")
+    lines.append(f"- Taux de rejet: {result['rejection_rate']:.2f}%")
+    lines.append(f"- CPU moyen utilisé: {result['avg_cpu']:.2f}%")
+    lines.append(f"- RAM moyenne utilisée: {result['avg_ram']:.2f}%")
+    lines.append(f"- Stockage moyen utilisé: {result['avg_storage']:.2f}%")
+    if result.get('utilization'):
+        utilization, fragmentation = result['utilization'], result['fragmentation']
+        lines.append(f"- Occupation de la flotte sur la journée: CPU {utilization['cpu']:.2f}%, RAM {utilization['ram']:.2f}%, Stockage {utilization['storage']:.2f}%")
+        lines.append(f"- Fragmentation de la capacité libre: CPU {fragmentation['cpu']:.2f}%, RAM {fragmentation['ram']:.2f}%, Stockage {fragmentation['storage']:.2f}%")
+    return "\n".join(lines) + "\n"
+
+def format_global(summary):
+    return (
+        "\n=== Résultats globaux ===\n"
+        f"Taux de rejet moyen: {summary['avg_rejection_rate']:.2f}%\n"
+        f"CPU moyen utilisé: {summary['avg_cpu']:.2f}%\n"
+        f"RAM moyenne utilisée: {summary['avg_ram']:.2f}%\n"
+        f"Stockage moyen utilisé: {summary['avg_storage']:.2f}%\n"
+    )
+
+def solve_in_background(pms, vm_files, cache=None):
+    # Corps commun des deux actions, exécuté dans le thread de travail
+    events.put(('scenarios', [num for num, _ in vm_files]))
+    events.put(('log', f"\nRésolution de {len(vm_files)} scénarios en parallèle...\n"))
+    
+    results = []
+    solver = solve_files(pms, vm_files, workers=None, events=progress_events, cancel=cancel_event, cache=cache)
+    try:
+        for result in solver:
+            if cancel_event.is_set():
+                break
+            results.append(result)
+            events.put(('result', result, format_result(result, pms), pms))
+    finally:
+        solver.close()
+    
+    if cancel_event.is_set():
+        events.put(('log', "\nCalcul annulé.\n"))
+        return
+    
+    results = sorted_results(results)
+    summary = global_summary(results)
+    if summary is not None:
+        events.put(('global', [result['rejection_rate'] for result in results], [result['scenario'] for result in results], format_global(summary)))
+
+def generate_job(n_physiques, vm_min, vm_max, step, n_scenarios):
+    events.put(('log', "Génération des scénarios en cours...\n"))
+    
+    timestamp = int(time.time())
+    scenario_folder = f"scenarios_{timestamp}"
+    os.makedirs(scenario_folder, exist_ok=True)
+    
+    pms, vms_list = generate_machines(n_physiques, vm_min, vm_max, step, n_scenarios)
+    save_to_txt(f"{scenario_folder}/{PM_FILENAME}", pms)
+    
+    vm_files = []
+    for idx, vms in enumerate(vms_list, start=1):  # Modification ici: start=1
+        filename = f"{scenario_folder}/machines_virtuelles_{idx}.txt"
+        save_to_txt(filename, vms)
+        vm_files.append((idx, filename))
+        events.put(('log', f"Scénario {idx}: {len(vms)} VMs générées\n"))
+    
+    solve_in_background(pms, vm_files)
+
+def load_job():
+    events.put(('log', "Chargement des scénarios existants...\n"))
+    
+    pm_path = pm_file()
+    if not os.path.exists(pm_path):
+        events.put(('log', f"Erreur: Fichier {PM_FILENAME} introuvable\n"))
+        return
+    
+    pms = read_machines(pm_path, is_vm=False)
+    
+    # Fichiers machines_virtuelles_N (.txt ou .npy) triés par numéro de scénario ;
+    # les scénarios inchangés depuis le dernier calcul sont relus depuis le cache
+    solve_in_background(pms, list_scenario_files(), ResultCache())
+
+def start_job(job, *args):
+    global progress_events, cancel_event
+    
+    submit_button.config(state=tk.DISABLED)
+    load_button.config(state=tk.DISABLED)
+    cancel_button.config(state=tk.NORMAL)
+    result_text.delete(1.0, tk.END)
+    clear_progress()
+    reset_charts()
+    
+    progress_events = multiprocessing.Queue()
+    cancel_event = multiprocessing.Event()
+    
+    def target():
+        try:
+            job(*args)
+        except Exception as e:
+            events.put(('error', f"Erreur: {str(e)}\n"))
+        finally:
+            events.put(('done',))
+    
+    threading.Thread(target=target, daemon=True).start()
+
+def on_cancel():
+    if cancel_event is not None:
+        cancel_event.set()
+    cancel_button.config(state=tk.DISABLED)
+    result_text.insert(tk.END, "\nAnnulation en cours...\n")
+
+def on_close():
+    if cancel_event is not None:
+        cancel_event.set()
+    render_executor.shutdown(wait=False, cancel_futures=True)
+    root.destroy()
+
+def clear_progress():
+    for child in progress_inner.winfo_children():
+        child.destroy()
+    progress_bars.clear()
+
+def create_progress(scenario_nums):
+    for row, num in enumerate(scenario_nums):
+        tk.Label(progress_inner, text=f"Scénario {num}", bg='#ADD8E6').grid(row=row, column=0, padx=5, sticky='w')
+        bar = ttk.Progressbar(progress_inner, length=400, maximum=100)
+        bar.grid(row=row, column=1, padx=5, pady=1)
+        status = tk.Label(progress_inner, text="en attente", bg='#ADD8E6', width=22, anchor='w')
+        status.grid(row=row, column=2, padx=5, sticky='w')
+        progress_bars[num] = (bar, status)
+
+def update_progress(scenario, iteration, iterations, best_score):
+    if scenario not in progress_bars:
+        return
+    bar, status = progress_bars[scenario]
+    if iterations:
+        bar['value'] = min(iteration / iterations * 100, 100)
+    status.config(text=f"itération {iteration} - {best_score} VMs")
+
+def poll_events():
+    # Relève les files sans jamais bloquer ; le texte est inséré en un seul bloc par passage
+    if not root.winfo_exists():
+        return
+    
+    latest = {}
+    while progress_events is not None:
+        try:
+            _, scenario, iteration, iterations, best_score = progress_events.get_nowait()
+        except queue.Empty:
+            break
+        latest[scenario] = (iteration, iterations, best_score)
+    for scenario, values in latest.items():
+        update_progress(scenario, *values)
+    
+    chunks = []
+    for _ in range(MAX_EVENTS_PER_POLL):
+        try:
+            event = events.get_nowait()
+        except queue.Empty:
+            break
+        kind = event[0]
+        if kind == 'log':
+            chunks.append(event[1])
+        elif kind == 'scenarios':
+            create_progress(event[1])
+        elif kind == 'result':
+            _, result, text, pms = event
+            chunks.append(text)
+            if result['scenario'] in progress_bars:
+                bar, status = progress_bars[result['scenario']]
+                bar['value'] = 100
+                origin = " (cache)" if result.get('cached') else ""
+                status.config(text=f"terminé{origin} - rejet {result['rejection_rate']:.1f}%")
+            add_chart_result(result, pms)
+        elif kind == 'global':
+            chunks.append(event[3])
+            set_chart_rejections(event[1], event[2])
+        elif kind == 'chart':
+            error = chart_rendered(event[1], event[2])
+            if error:
+                chunks.append(error)
+        elif kind == 'error':
+            result_text.delete(1.0, tk.END)
+            chunks = [event[1]]
+        elif kind == 'done':
+            submit_button.config(state=tk.NORMAL)
+            load_button.config(state=tk.NORMAL)
+            cancel_button.config(state=tk.DISABLED)
+    
+    if chunks:
+        result_text.insert(tk.END, "".join(chunks))
+        result_text.see(tk.END)
+    
+    root.after(POLL_INTERVAL, poll_events)
+
+def on_submit():
+    try:
+        n_physiques = int(entry_n_physiques.get())
+        vm_min = int(entry_vm_min.get())
+        vm_max = int(entry_vm_max.get())
+        step = int(entry_step.get())
+        n_scenarios = int(entry_n_scenarios.get())
+    except ValueError as e:
+        result_text.delete(1.0, tk.END)
+        result_text.insert(tk.END, f"Erreur: {str(e)}\n")
+        return
+    
+    if vm_min > vm_max:
+        result_text.delete(1.0, tk.END)
+        result_text.insert(tk.END, "Erreur: Le minimum ne peut pas être supérieur au maximum.\n")
+        return
+    if step <= 0:
+        result_text.delete(1.0, tk.END)
+        result_text.insert(tk.END, "Erreur: Le pas doit être un entier positif.\n")
+        return
+    
+    start_job(generate_job, n_physiques, vm_min, vm_max, step, n_scenarios)
+
+def load_existing_scenarios():
+    start_job(load_job)
+
+def main():
+    # Interface graphique
+    global root, entry_n_physiques, entry_vm_min, entry_vm_max, entry_step, entry_n_scenarios
+    global submit_button, load_button, cancel_button, progress_inner, result_text
+    
+    root = tk.Tk()
+    root.title("Placement de Machines Virtuelles - Optimisation")
+    root.geometry("700x860")
+    root.resizable(False, False)
+    root.configure(bg='#ADD8E6')
+
+    frame = tk.Frame(root, bg='#ADD8E6')
+    frame.pack(padx=10, pady=10)
+
+    for i in range(6):
+        frame.grid_rowconfigure(i, weight=1)
+    frame.grid_columnconfigure(0, weight=1)
+    frame.grid_columnconfigure(1, weight=1)
+
+    tk.Label(frame, text="Nombre de machines physiques (PMs):", bg='#ADD8E6').grid(row=0, column=0, padx=10, pady=5, sticky='w')
+    entry_n_physiques = tk.Entry(frame)
+    entry_n_physiques.grid(row=0, column=1, padx=10, pady=5, sticky='ew')
+
+    tk.Label(frame, text="Nombre minimum de VMs par scénario:", bg='#ADD8E6').grid(row=1, column=0, padx=10, pady=5, sticky='w')
+    entry_vm_min = tk.Entry(frame)
+    entry_vm_min.grid(row=1, column=1, padx=10, pady=5, sticky='ew')
+
+    tk.Label(frame, text="Nombre maximum de VMs par scénario:", bg='#ADD8E6').grid(row=2, column=0, padx=10, pady=5, sticky='w')
+    entry_vm_max = tk.Entry(frame)
+    entry_vm_max.grid(row=2, column=1, padx=10, pady=5, sticky='ew')
+
+    tk.Label(frame, text="Pas pour le nombre de VMs:", bg='#ADD8E6').grid(row=3, column=0, padx=10, pady=5, sticky='w')
+    entry_step = tk.Entry(frame)
+    entry_step.grid(row=3, column=1, padx=10, pady=5, sticky='ew')
+
+    tk.Label(frame, text="Nombre de scénarios (fichiers VM):", bg='#ADD8E6').grid(row=4, column=0, padx=10, pady=5, sticky='w')
+    entry_n_scenarios = tk.Entry(frame)
+    entry_n_scenarios.grid(row=4, column=1, padx=10, pady=5, sticky='ew')
+
+    submit_button = tk.Button(frame, text="Générer et Calculer", command=on_submit, bg="#1b019b", fg="white", width=20)
+    submit_button.grid(row=5, column=0, columnspan=2, pady=10)
+
+    load_button = tk.Button(frame, text="Charger scénarios existants", command=load_existing_scenarios, bg="#019b1d", fg="white", width=20)
+    load_button.grid(row=6, column=0, columnspan=2, pady=10)
+
+    cancel_button = tk.Button(frame, text="Annuler", command=on_cancel, bg="#9b0119", fg="white", width=20, state=tk.DISABLED)
+    cancel_button.grid(row=7, column=0, columnspan=2, pady=10)
+
+    charts_button = tk.Button(frame, text="Graphiques", command=open_dashboard, bg="#5b5b5b", fg="white", width=20)
+    charts_button.grid(row=8, column=0, columnspan=2, pady=10)
+
+    # Une barre de progression par scénario, dans une zone défilante
+    progress_frame = tk.Frame(root, bg='#ADD8E6')
+    progress_frame.pack(padx=10, pady=(0, 10), fill=tk.X)
+    progress_canvas = tk.Canvas(progress_frame, height=120, bg='#ADD8E6', highlightthickness=0)
+    progress_scrollbar = tk.Scrollbar(progress_frame, orient=tk.VERTICAL, command=progress_canvas.yview)
+    progress_canvas.configure(yscrollcommand=progress_scrollbar.set)
+    progress_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    progress_canvas.pack(side=tk.LEFT, fill=tk.X, expand=True)
+    progress_inner = tk.Frame(progress_canvas, bg='#ADD8E6')
+    progress_canvas.create_window((0, 0), window=progress_inner, anchor='nw')
+    progress_inner.bind("<Configure>", lambda e: progress_canvas.configure(scrollregion=progress_canvas.bbox("all")))
+
+    result_frame = tk.Frame(root)
+    result_frame.pack(padx=10, pady=(0,10), fill=tk.BOTH, expand=True)
+
+    result_text = scrolledtext.ScrolledText(result_frame, width=80, height=25, bg='#f0f8ff', wrap=tk.WORD)
+    result_text.pack(fill=tk.BOTH, expand=True)
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
+    root.after(POLL_INTERVAL, poll_events)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from vmplacement import ResultCache, generate_machines, solve_files
+
+# Clé du cache : seuls les paramètres qui changent le placement comptent
+
+def test_key_ignores_profile_and_default_values(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    pms, [vms] = generate_machines(4, 50, 50, 1, 1, seed=1)
+    gui = cache.key(vms, pms, {})
+    cli = {'iterations': 100, 'tabu_size': 10, 'seed': 0, 'time_limit': None, 'stagnation': None, 'starts': None, 'decompose': False}
+    assert cache.key(vms, pms, {**cli, 'profile': False}) == gui
+    assert cache.key(vms, pms, {**cli, 'profile': True}) == gui
+    assert cache.key(vms, pms, {'iterations': 50}) != gui
+    assert cache.key(vms, pms, {'decompose': True}) != gui
+
+def test_profiled_results_are_recomputed_and_stored_without_stats(tmp_path):
+    folder = tmp_path / "scenario"
+    folder.mkdir()
+    pms, [vms] = generate_machines(4, 50, 50, 1, 1, seed=2)
+    path = folder / "machines_virtuelles_1.txt"
+    path.write_text("".join(" ".join(map(str, vm)) + "\n" for vm in vms))
+    cache = ResultCache(str(tmp_path / "cache"))
+    params = {'iterations': 5, 'profile': True}
+    [first] = solve_files(pms, [(1, str(path))], cache=cache, **params)
+    [again] = solve_files(pms, [(1, str(path))], cache=cache, **params)
+    assert 'stats' in first and 'stats' in again and not again.get('cached')
+    [plain] = solve_files(pms, [(1, str(path))], cache=cache, iterations=5)
+    assert plain.get('cached') and 'stats' not in plain
+    assert plain['placed'] == first['placed']
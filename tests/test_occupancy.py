@@ -0,0 +1,177 @@
+import random
+
+import pytest
+
+from vmplacement import HORIZON, CapacityProfile, FleetOccupancy, ProfileOccupancy, as_pms, as_vms, is_feasible, make_occupancy
+from vmplacement.occupancy import HeadroomIndex, MaxAddTree, mask_indices, np
+
+# Vérifications aléatoires des structures d'occupation contre la version de référence (is_feasible) et
+# contre un calcul exhaustif du pic de concurrence
+
+needs_numpy = pytest.mark.skipif(np is None, reason="NumPy requis")
+
+def random_pms(rng, count):
+    return [[f"PM{k}", rng.randint(8, 32), rng.randint(16, 64), rng.randint(100, 400)] for k in range(count)]
+
+def random_vms(rng, count, horizon=HORIZON):
+    vms = []
+    for k in range(count):
+        arrival = rng.randrange(horizon)
+        # Quelques fenêtres vides ou qui débordent de l'horizon
+        departure = rng.choice([arrival, rng.randint(arrival, horizon), rng.randint(arrival, horizon + 60)])
+        vms.append([f"VM{k}", rng.randint(1, 8), rng.randint(1, 16), rng.randint(10, 100), arrival, departure])
+    return vms
+
+def brute_peak(assigned, start, end):
+    # Pic (cpu, ram, stockage) des VMs actives sur [start, end), intervalles semi-ouverts
+    instants = {start} | {vm[4] for vm in assigned if start <= vm[4] < end}
+    peak = [0, 0, 0]
+    for t in instants:
+        active = [vm for vm in assigned if vm[4] <= t < vm[5]]
+        for r in range(3):
+            peak[r] = max(peak[r], sum(vm[r + 1] for vm in active))
+    return tuple(peak)
+
+def loaded(rng, occupancy_class, n_pms=6, n_vms=80):
+    # Flotte remplie au hasard par des VMs faisables, avec les VMs de chaque PM
+    pms = as_pms(random_pms(rng, n_pms))
+    vms = as_vms(random_vms(rng, n_vms))
+    occupancy = occupancy_class(pms)
+    assigned = [[] for _ in range(len(pms))]
+    for vm in vms:
+        i = rng.randrange(len(pms))
+        if is_feasible(pms[i], vm, assigned[i]):
+            occupancy.add(i, vm)
+            assigned[i].append(vm)
+    return pms, occupancy, assigned
+
+def probes(rng, count=60):
+    return list(as_vms(random_vms(rng, count)))
+
+def test_max_add_tree_matches_list():
+    rng = random.Random(1)
+    for size in (1, 7, 64, 100):
+        tree = MaxAddTree(size)
+        values = [0] * size
+        for _ in range(300):
+            left = rng.randrange(size)
+            right = rng.randint(left + 1, size)
+            if rng.random() < 0.6:
+                value = rng.randint(-5, 10)
+                tree.add(left, right, value)
+                for k in range(left, right):
+                    values[k] += value
+            else:
+                assert tree.max(left, right) == max(0, max(values[left:right]))
+
+def test_capacity_profile_exact_peak():
+    rng = random.Random(2)
+    pm = as_pms(random_pms(rng, 1))[0]
+    profile = CapacityProfile(pm)
+    assigned = []
+    for vm in as_vms(random_vms(rng, 200)):
+        assert profile.fits(vm) == is_feasible(pm, vm, assigned)
+        if profile.fits(vm):
+            profile.add(vm)
+            assigned.append(vm)
+        start = rng.randrange(HORIZON)
+        end = rng.randint(start + 1, HORIZON)
+        assert profile.peak(start, end) == brute_peak(assigned, start, end)
+    for vm in assigned[::2]:
+        profile.remove(vm)
+    assigned = assigned[1::2]
+    assert profile.peak(0, HORIZON) == brute_peak(assigned, 0, HORIZON)
+
+def test_back_to_back_windows_do_not_overlap():
+    pm = as_pms([["PM", 4, 4, 4]])[0]
+    first, second = as_vms([["A", 4, 4, 4, 0, 60], ["B", 4, 4, 4, 60, 120]])
+    profile = CapacityProfile(pm)
+    profile.add(first)
+    assert profile.fits(second)
+    assert is_feasible(pm, second, [first])
+
+@pytest.mark.parametrize("occupancy_class", [ProfileOccupancy, pytest.param(FleetOccupancy, marks=needs_numpy)])
+def test_fleet_queries_match_reference(occupancy_class):
+    rng = random.Random(3)
+    for _ in range(5):
+        pms, occupancy, assigned = loaded(rng, occupancy_class)
+        vms = probes(rng)
+        matrix = occupancy.feasible_matrix(vms)
+        for vm, row in zip(vms, matrix):
+            expected = [is_feasible(pm, vm, assigned[i]) for i, pm in enumerate(pms)]
+            assert [occupancy.fits(i, vm) for i in range(len(pms))] == expected
+            assert mask_indices(occupancy.feasible_mask(vm)) == mask_indices(expected)
+            assert mask_indices(row) == mask_indices(expected)
+        for i in range(len(pms)):
+            assert list(occupancy.fits_many(i, vms)) == [is_feasible(pms[i], vm, assigned[i]) for vm in vms]
+
+@pytest.mark.parametrize("occupancy_class", [ProfileOccupancy, pytest.param(FleetOccupancy, marks=needs_numpy)])
+def test_deficits_and_fits_without_match_brute_force(occupancy_class):
+    rng = random.Random(4)
+    for _ in range(5):
+        pms, occupancy, assigned = loaded(rng, occupancy_class)
+        for vm in probes(rng):
+            if vm[4] >= vm[5]:
+                continue
+            expected = []
+            for i, pm in enumerate(pms):
+                if any(demand > capacity for demand, capacity in zip(vm[1:4], pm[1:4])):
+                    continue
+                peak = brute_peak(assigned[i], vm[4], min(vm[5], HORIZON))
+                missing = tuple(used + demand - capacity for used, demand, capacity in zip(peak, vm[1:4], pm[1:4]))
+                if max(missing) > 0:
+                    expected.append((i, missing))
+            assert occupancy.deficits(vm) == expected
+            i = rng.randrange(len(pms))
+            removed = rng.sample(assigned[i], min(2, len(assigned[i])))
+            remaining = [other for other in assigned[i] if other not in removed]
+            assert occupancy.fits_without(i, vm, removed) == is_feasible(pms[i], vm, remaining)
+        # fits_without ne modifie pas l'état
+        for i, pm in enumerate(pms):
+            assert occupancy.peak(i, 0, HORIZON) == brute_peak(assigned[i], 0, HORIZON)
+
+@pytest.mark.parametrize("occupancy_class", [ProfileOccupancy, pytest.param(FleetOccupancy, marks=needs_numpy)])
+def test_fit_rules_pick_feasible_pms(occupancy_class):
+    rng = random.Random(5)
+    pms, occupancy, assigned = loaded(rng, occupancy_class)
+    for vm in probes(rng):
+        feasible = [i for i, pm in enumerate(pms) if is_feasible(pm, vm, assigned[i])]
+        assert occupancy.first_fit(vm) == (feasible[0] if feasible else -1)
+        for choose in (occupancy.best_fit, occupancy.worst_fit):
+            i = choose(vm)
+            assert i in feasible if feasible else i == -1
+
+@needs_numpy
+def test_add_many_matches_add():
+    rng = random.Random(6)
+    pms, occupancy, assigned = loaded(rng, FleetOccupancy)
+    bulk = FleetOccupancy(pms)
+    indices = [i for i, vms in enumerate(assigned) for _ in vms]
+    bulk.add_many(indices, [vm for vms in assigned for vm in vms])
+    assert np.array_equal(bulk.usage, occupancy.usage)
+    assert np.array_equal(bulk.block_max, occupancy.block_max)
+
+@pytest.mark.parametrize("rule, method", [('first', 'first_fit'), ('best', 'best_fit'), ('worst', 'worst_fit')])
+@pytest.mark.parametrize("vectorized", [False, pytest.param(True, marks=needs_numpy)])
+def test_headroom_index_matches_occupancy(rule, method, vectorized):
+    # Balayage par ordre d'arrivée : l'index et l'occupation choisissent la même PM à chaque VM
+    rng = random.Random(7)
+    for n_pms in (3, 70, 130):
+        pms = as_pms(random_pms(rng, n_pms))
+        vms = sorted(as_vms(random_vms(rng, 12 * n_pms)), key=lambda vm: vm[4])
+        index = HeadroomIndex(pms)
+        if not vectorized:
+            index.free = None
+        occupancy = make_occupancy(pms, vectorized=vectorized)
+        for vm in vms:
+            i = index.choose(vm, rule)
+            assert i == getattr(occupancy, method)(vm)
+            if i >= 0:
+                index.add(i, vm)
+                occupancy.add(i, vm)
+
+def test_headroom_index_rejects_out_of_order_sweep():
+    index = HeadroomIndex(as_pms([["PM", 4, 4, 4]]))
+    index.choose(as_vms([["A", 1, 1, 1, 100, 200]])[0])
+    with pytest.raises(ValueError):
+        index.choose(as_vms([["B", 1, 1, 1, 50, 200]])[0])
@@ -0,0 +1,245 @@
+import queue
+import random
+import socket
+import threading
+
+import pytest
+
+from vmplacement import (HORIZON, INITIAL_STRATEGIES, apply_diff, as_pms, as_vms, generate_machines, incremental_search,
+                         decomposed_search, initial_placement, is_feasible, make_occupancy, placement_upper_bound,
+                         tabu_search, time_blocks)
+from vmplacement import decompose, solve_files
+from vmplacement.runner import progress_hook
+from vmplacement.online import OnlinePlacer, handle_line, serve_socket
+
+# Toute solution produite doit respecter la version de référence du test de faisabilité
+
+def assert_feasible(solution):
+    # Chaque VM placée une seule fois, chaque PM faisable VM par VM, score = nombre de VMs placées
+    placed = 0
+    seen = set()
+    for i in range(len(solution.pms)):
+        hosted = solution.vms_on(i)
+        for k, vm in enumerate(hosted):
+            assert is_feasible(solution.pms[i], vm, hosted[:k])
+            assert vm[0] not in seen
+            assert solution.location[vm[0]] == i
+            seen.add(vm[0])
+            placed += 1
+    assert placed == solution.score() == len(solution.vms) - len(solution.unplaced)
+
+def scenario(seed, n_pms=8, n_vms=300):
+    pms, [vms] = generate_machines(n_pms, n_vms, n_vms, 1, 1, seed=seed)
+    return as_vms(vms), as_pms(pms)
+
+@pytest.mark.parametrize("strategy", INITIAL_STRATEGIES)
+def test_initial_placement_index_matches_occupancy(strategy):
+    # Flotte vide : le chemin par l'index des marges fait les mêmes choix que les tests sur l'occupation
+    for seed in range(3):
+        vms, pms = scenario(seed)
+        fast, _ = initial_placement(vms, pms, strategy=strategy, seed=seed)
+        reference, _ = initial_placement(vms, pms, make_occupancy(pms, vectorized=False), strategy=strategy, seed=seed)
+        assert list(fast.location) == list(reference.location)
+        assert_feasible(fast)
+
+@pytest.mark.parametrize("strategy", INITIAL_STRATEGIES)
+def test_tabu_search_results_are_feasible(strategy):
+    for seed in range(3):
+        vms, pms = scenario(seed)
+        solution, unplaced, score = tabu_search(vms, pms, iterations=30, seed=seed, strategy=strategy)
+        assert_feasible(solution)
+        assert score == solution.score() == len(vms) - len(unplaced)
+        assert score <= placement_upper_bound(vms, pms)
+
+def test_tabu_search_respects_preloaded_occupancy():
+    # VMs déjà en place sur la PM 0 (hors scénario) : la solution doit tenir avec elles
+    vms, pms = scenario(4)
+    occupancy = make_occupancy(pms)
+    fixed = list(as_vms([["F0", 4, 8, 50, 0, 720], ["F1", 4, 8, 50, 600, 1440]]))
+    for vm in fixed:
+        occupancy.add(0, vm)
+    solution, _, _ = tabu_search(vms, pms, iterations=20, occupancy=occupancy)
+    hosted = list(fixed)
+    for vm in solution.vms_on(0):
+        assert is_feasible(pms[0], vm, hosted)
+        hosted.append(vm)
+
+def test_incremental_search_results_are_feasible():
+    rng = random.Random(5)
+    vms, pms = scenario(5, n_pms=12, n_vms=500)
+    previous, _, _ = tabu_search(vms, pms, iterations=20)
+    names = vms.names
+    removed = rng.sample(names, 10)
+    changed = [[name, 2, 4, 20, 100, 900] for name in rng.sample([n for n in names if n not in removed], 5)]
+    added = [[f"NEW_{k}", 2, 4, 30, 60 * k, 60 * k + 300] for k in range(5)]
+    fleet = pms.to_lists()
+    fleet[0][1] = max(1, fleet[0][1] - 8)
+    fleet.append(["PM_NEW", 32, 64, 400])
+    solution, unplaced, score = incremental_search(previous, added, removed, changed, fleet)
+    assert_feasible(solution)
+    assert len(solution.vms) == len(vms) - len(removed) + len(added)
+    assert score == len(solution.vms) - len(unplaced)
+
+def test_apply_diff_keeps_untouched_assignments():
+    pms = [["P1", 10, 10, 10], ["P2", 10, 10, 10], ["P3", 10, 10, 10]]
+    vms = [["A", 6, 6, 6, 0, 100], ["B", 6, 6, 6, 0, 100], ["C", 6, 6, 6, 0, 100], ["D", 6, 6, 6, 50, 150], ["E", 20, 1, 1, 0, 10]]
+    previous, _, _ = tabu_search(vms, pms, iterations=10)
+    before = {previous.vms.names[v]: previous.pms.names[previous.location[v]] for v in range(len(vms)) if previous.location[v] >= 0}
+    assert "E" not in before and len(before) == 3
+    gone = next(name for name in "ABC" if name in before)
+    moved = next(name for name in "ABC" if name in before and name != gone)
+    placement, displaced, freed = apply_diff(previous, added=[["F", 1, 1, 1, 200, 300]], removed=[gone],
+                                             changed=[[moved, 2, 2, 2, 0, 100]])
+    names = placement.vms.names
+    assert gone not in names and len(names) == len(vms)
+    # Ajoutées et modifiées à replacer ; la VM rejetée et inchangée (E) n'est pas reprise
+    assert sorted(names[v] for v in displaced) == sorted(["F", moved])
+    assert placement.location[names.index("E")] < 0
+    # Les autres gardent leur PM
+    for v, name in enumerate(names):
+        if name in before and name != moved:
+            assert placement.pms.names[placement.location[v]] == before[name]
+    # Fenêtres libérées sur les PMs des VMs annulées et modifiées
+    for name in (gone, moved):
+        assert freed[placement.pms.names.index(before[name])] == [(0, 100)]
+    assert placement.occupancy.peak(placement.pms.names.index(before[gone]), 0, HORIZON) == (0, 0, 0)
+
+def test_apply_diff_fleet_changes():
+    pms = [["P1", 10, 10, 10], ["P2", 10, 10, 10]]
+    vms = [["A", 6, 6, 6, 0, 100], ["B", 6, 6, 6, 0, 100]]
+    previous, _, _ = tabu_search(vms, pms, iterations=5)
+    host = {name: previous.pms.names[previous.location[v]] for v, name in enumerate(previous.vms.names)}
+    # PM de A retirée, PM de B réduite sous sa demande, nouvelle PM : tout l'horizon y est libre
+    fleet = [[host["B"], 4, 10, 10], ["P3", 10, 10, 10]]
+    placement, displaced, freed = apply_diff(previous, pms=fleet)
+    assert sorted(placement.vms.names[v] for v in displaced) == ["A", "B"]
+    assert freed[placement.pms.names.index("P3")] == [(0, HORIZON)]
+    assert freed[placement.pms.names.index(host["B"])] == [(0, 100)]
+    solution, unplaced, score = incremental_search(previous, pms=fleet)
+    assert_feasible(solution)
+    assert score == 1 and [vm[0] for vm in unplaced] == [solution.vms.names.index("B")]
+
+def test_apply_diff_rejects_unknown_and_duplicate_vms():
+    previous, _, _ = tabu_search([["A", 1, 1, 1, 0, 10]], [["P1", 10, 10, 10]], iterations=1)
+    with pytest.raises(ValueError):
+        apply_diff(previous, removed=["Z"])
+    with pytest.raises(ValueError):
+        apply_diff(previous, changed=[["Z", 1, 1, 1, 0, 10]])
+    with pytest.raises(ValueError):
+        apply_diff(previous, added=[["A", 1, 1, 1, 0, 10]])
+    # Annulée puis ajoutée de nouveau sous le même nom : accepté
+    placement, displaced, _ = apply_diff(previous, added=[["A", 2, 2, 2, 0, 10]], removed=["A"])
+    assert placement.vms.names[displaced[0]] == "A" and placement.vms[displaced[0]][1] == 2
+
+def test_incremental_search_replaces_changed_vm_rejected_before():
+    # C est rejetée (trop de CPU) ; modifiée, elle tient dans une fenêtre où aucune place n'a été libérée
+    pms = [["P1", 10, 10, 10], ["P2", 10, 10, 10]]
+    vms = [["A", 8, 8, 8, 0, 100], ["B", 8, 8, 8, 0, 100], ["C", 20, 8, 8, 0, 100]]
+    previous, _, score = tabu_search(vms, pms, iterations=5)
+    assert score == 2
+    changed = [["C", 1, 1, 1, 500, 600]]
+    placement, displaced, freed = apply_diff(previous, changed=changed)
+    assert [placement.vms.names[v] for v in displaced] == ["C"] and freed == {}
+    solution, unplaced, score = incremental_search(previous, changed=changed)
+    assert_feasible(solution)
+    assert score == 3 and unplaced == []
+
+def test_online_placer_admits_and_releases():
+    placer = OnlinePlacer([["P1", 10, 10, 10], ["P2", 10, 10, 10]])
+    assert placer.submit(["A", 8, 8, 8, 0, 100]) == "P1"
+    assert placer.submit(["B", 8, 8, 8, 50, 150]) == "P2"
+    assert placer.submit(["C", 8, 8, 8, 60, 120]) is None
+    assert placer.location("A") == "P1" and placer.location("C") is None
+    with pytest.raises(ValueError):
+        placer.submit(["A", 1, 1, 1, 0, 10])
+    # Départ de A : sa PM redevient libre ; la partie écoulée d'une réservation n'est pas réservée
+    assert placer.advance(100) == ["A"]
+    assert placer.submit(["D", 8, 8, 8, 0, 200]) == "P1"
+    with pytest.raises(ValueError):
+        placer.advance(50)
+    assert placer.release("D") and not placer.release("D")
+    assert placer.stats == {'submitted': 4, 'accepted': 3, 'rejected': 1, 'released': 1, 'expired': 1, 'reoptimized': 0}
+
+def test_handle_line_protocol():
+    placer = OnlinePlacer([["P1", 10, 10, 10]])
+    assert handle_line(placer, "A 8 8 8 0 100\n") == "A P1"
+    assert handle_line(placer, b"B 8 8 8 50 150\n") == "B REJECT"
+    assert handle_line(placer, "release A") == "A RELEASED"
+    assert handle_line(placer, "release A") == "A UNKNOWN"
+    assert handle_line(placer, "C 1 1 1 0 10") == "C P1"
+    assert handle_line(placer, "advance 20") == "EXPIRED C"
+    assert handle_line(placer, "  \n") is None
+    assert handle_line(placer, "E 1 1 1 30 40") == "E P1"
+    for bad in ("status", "D 1 1 x 0 10", "advance 5", "E 1 1 1 30 40", b"\xff\xfe 1 1 1 0 10"):
+        assert handle_line(placer, bad).startswith("ERROR")
+
+def test_serve_socket_survives_bad_lines():
+    placer = OnlinePlacer([["P1", 10, 10, 10]])
+    with serve_socket(placer, 0) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with socket.create_connection(server.server_address, timeout=5) as client:
+                client.sendall(b"\xff\xfe\n" b"A 1 1 1 0 10\n")
+                reader = client.makefile('rb')
+                replies = [reader.readline(), reader.readline()]
+        finally:
+            server.shutdown()
+    assert replies[0].startswith(b"ERROR") and replies[1] == b"A P1\n"
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_time_blocks_partition_without_overlap(vectorized, monkeypatch):
+    if not vectorized:
+        monkeypatch.setattr(decompose, "np", None)
+    elif decompose.np is None:
+        pytest.skip("NumPy requis")
+    rng = random.Random(8)
+    # Fenêtres courtes et dispersées (nombreux blocs), fenêtres vides et VMs arrivant au départ d'une autre
+    rows = [[f"VM{k}", 1, 1, 1, start, start + rng.choice([0, 5, 30])] for k, start in enumerate(rng.sample(range(10, HORIZON, 10), 120))]
+    rows += [["EDGE_A", 1, 1, 1, 0, 7], ["EDGE_B", 1, 1, 1, 7, 9]]
+    vms = as_vms(rows)
+    blocks = time_blocks(vms)
+    assert sorted(v for block in blocks for v in block) == list(range(len(vms)))
+    assert len(blocks) > 10
+    for first, second in zip(blocks, blocks[1:]):
+        # Blocs chronologiques, sans instant commun
+        assert max(vms[v][5] for v in first) <= min(vms[v][4] for v in second)
+    assert not any(vms.names.index("EDGE_A") in block and vms.names.index("EDGE_B") in block for block in blocks)
+
+def test_decomposed_search_results_are_feasible():
+    for seed in range(2):
+        pms, [vms] = generate_machines(6, 200, 200, 1, 1, seed=seed)
+        # Journée coupée en deux : deux groupes de VMs sans recouvrement
+        shift = [0, HORIZON // 2]
+        vms = [[*vm[:4], vm[4] // 2 + shift[k % 2], min(vm[5], HORIZON) // 2 + shift[k % 2]] for k, vm in enumerate(vms)]
+        solution, unplaced, score = decomposed_search(vms, pms, iterations=10)
+        assert len(time_blocks(vms)) >= 2
+        assert_feasible(solution)
+        assert score == len(vms) - len(unplaced)
+
+def test_progress_hook_publishes_and_cancels():
+    events, cancel = queue.Queue(), threading.Event()
+    stop = progress_hook(3, 10, events, cancel)
+    assert stop(5, 0) is False and stop(6, 0) is False
+    assert [events.get_nowait(), events.get_nowait()] == [('progress', 3, 1, 10, 5), ('progress', 3, 2, 10, 6)]
+    cancel.set()
+    assert stop(6, 1) is True
+
+def test_solve_files_reports_progress_and_honours_cancel(tmp_path):
+    pms, scenarios = generate_machines(4, 60, 80, 20, 2, seed=9)
+    vm_files = []
+    for num, vms in enumerate(scenarios, start=1):
+        path = tmp_path / f"machines_virtuelles_{num}.txt"
+        path.write_text("".join(" ".join(map(str, vm)) + "\n" for vm in vms))
+        vm_files.append((num, str(path)))
+    events, cancel = queue.Queue(), threading.Event()
+    results = list(solve_files(pms, vm_files, events=events, cancel=cancel, iterations=5))
+    assert [result['scenario'] for result in results] == [1, 2]
+    progress = []
+    while not events.empty():
+        progress.append(events.get_nowait())
+    assert {event[1] for event in progress} == {1, 2}
+    assert all(event[0] == 'progress' and event[3] == 5 for event in progress)
+    # Annulation : aucun scénario n'est plus soumis
+    cancel.set()
+    assert list(solve_files(pms, vm_files, events=events, cancel=cancel, iterations=5)) == []
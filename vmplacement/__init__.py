@@ -0,0 +1,14 @@
+# Moteur de placement de VMs pré-planifiées, utilisable sans Tk ni matplotlib
+
+from .occupancy import HORIZON, CapacityProfile, FleetOccupancy, ProfileOccupancy, is_feasible, make_occupancy
+from .cache import ResultCache
+from .decompose import decomposed_search, time_blocks
+from .incremental import apply_diff, incremental_search
+from .model import MachineTable, PMTable, VMTable, as_pms, as_vms
+from .multistart import multi_start_search
+from .placement import Placement
+from .runner import global_summary, solve_files, solve_folder, solve_scenario, sorted_results
+from .scenarios import PM_FILENAME, generate_machines, list_scenario_files, pm_file, read_from_txt, read_machines, read_table, save_to_txt
+from .search import INITIAL_STRATEGIES, evaluate, initial_placement, placement_upper_bound, tabu_search, tabu_search_iter
+from .stats import SolverStats, collapsed_stacks
+from .usage import average_usage, calculate_resource_usage
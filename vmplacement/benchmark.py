@@ -0,0 +1,197 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+from .cache import SOLVER_VERSION
+from .generator import duration, pm_records, uniform, vm_batches
+from .model import PMTable, VMTable
+from .occupancy import HORIZON, is_feasible
+from .search import initial_placement, tabu_search
+from .usage import calculate_resource_usage
+
+try:
+    import resource
+except ImportError:  # Windows : pas de mesure du pic de mémoire
+    resource = None
+
+# Grilles de cas : nombre de PMs × nombre de VMs × densité (durée moyenne d'une VM en fraction de l'horizon)
+PRESETS = {
+    'quick': {'pms': [10, 100], 'vms': [100, 1000], 'densities': [0.05, 0.25]},
+    'full': {'pms': [10, 100, 1000, 5000], 'vms': [100, 10_000, 100_000, 1_000_000], 'densities': [0.01, 0.05, 0.25]},
+}
+# Indicateurs comparés à la référence : (clé, sens), +1 si une hausse est une régression, -1 si c'est une baisse
+COMPARED = [('initial_time', 1), ('tabu_time', 1), ('usage_time', 1), ('peak_rss_mb', 1),
+            ('fits_per_s', -1), ('masks_per_s', -1), ('is_feasible_per_s', -1), ('rejection_rate', 1)]
+
+def make_case(n_pms, n_vms, density, seed=0):
+    # Scénario synthétique reproductible : la graine dépend du cas, pas de l'ordre d'exécution
+    sequence = np.random.SeedSequence([seed, n_pms, n_vms, int(density * 1_000_000)])
+    pm_seed, vm_seed = sequence.spawn(2)
+    profile = {'duration': duration(uniform(0, int(2 * density * HORIZON)))}
+    pms = PMTable.from_records(*pm_records(n_pms, pm_seed))
+    vms = VMTable.from_records(*next(vm_batches(n_vms, vm_seed, profile, chunk=n_vms)))
+    return vms, pms
+
+def throughput(check, items, budget, repeat=1):
+    # Nombre d'appels check(item) par seconde : les items sont repris en boucle jusqu'à épuisement du budget
+    # (secondes) ; meilleur débit sur `repeat` mesures, comme pour les temps
+    if not items:
+        return 0.0
+    best = 0.0
+    for _ in range(max(repeat, 1)):
+        count = 0
+        started = time.perf_counter()
+        deadline = started + budget
+        for item in itertools.cycle(items):
+            check(*item)
+            count += 1
+            if time.perf_counter() >= deadline:
+                break
+        best = max(best, count / (time.perf_counter() - started))
+    return best
+
+def timed(function, *args, repeat=1, **kwargs):
+    # Meilleur temps sur `repeat` exécutions (le minimum est la mesure la moins bruitée) et dernier résultat
+    best = float('inf')
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        result = function(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+def run_case(n_pms, n_vms, density, seed=0, iterations=20, budget=0.2, repeat=3):
+    vms, pms = make_case(n_pms, n_vms, density, seed)
+    case = {'pms': n_pms, 'vms': n_vms, 'density': density, 'seed': seed, 'iterations': iterations}
+
+    case['initial_time'], (placement, unplaced) = timed(initial_placement, vms, pms, repeat=repeat)
+    case['initial_rejection_rate'] = 100 * len(unplaced) / n_vms if n_vms else 0
+
+    # Débit des tests de faisabilité contre l'état de la flotte après le placement initial
+    rng = random.Random(seed)
+    occupancy = placement.occupancy
+    sample = [vms[rng.randrange(n_vms)] for _ in range(min(n_vms, 5000))]
+    pairs = [(rng.randrange(n_pms), vm) for vm in sample]
+    case['fits_per_s'] = throughput(occupancy.fits, pairs, budget, repeat)
+    case['masks_per_s'] = throughput(occupancy.feasible_mask, [(vm,) for vm in sample], budget, repeat)
+    hosted = {i: placement.vms_on(i) for i in {i for i, _ in pairs[:200]}}
+    case['is_feasible_per_s'] = throughput(is_feasible, [(pms[i], vm, hosted[i]) for i, vm in pairs[:200]], budget, repeat)
+
+    case['tabu_time'], (best_solution, unplaced, score) = timed(tabu_search, vms, pms, iterations=iterations, seed=seed, repeat=repeat)
+    case['rejection_rate'] = 100 * len(unplaced) / n_vms if n_vms else 0
+
+    case['usage_time'], _ = timed(calculate_resource_usage, best_solution, pms, repeat=repeat)
+
+    # Pic de mémoire résidente du processus dédié au cas (ru_maxrss est en Kio sous Linux, en octets sous macOS)
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        case['peak_rss_mb'] = peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    else:
+        case['peak_rss_mb'] = None
+    return case
+
+def run_grid(pms, vms, densities, seed=0, iterations=20, budget=0.2, repeat=3, progress=None):
+    # Chaque cas tourne dans un processus neuf : le pic de mémoire mesuré est celui du cas seul
+    cases = []
+    with multiprocessing.Pool(1, maxtasksperchild=1) as pool:
+        for n_pms in pms:
+            for n_vms in vms:
+                for density in densities:
+                    case = pool.apply(run_case, (n_pms, n_vms, density, seed, iterations, budget, repeat))
+                    cases.append(case)
+                    if progress is not None:
+                        progress(case)
+    return cases
+
+def metadata():
+    return {
+        'solver_version': SOLVER_VERSION,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def case_key(case):
+    return case['pms'], case['vms'], case['density'], case['seed'], case['iterations']
+
+def compare(cases, baseline, tolerance=0.2, quality_tolerance=0.5, floor=0.01, call_floor=2e-6):
+    # Compare chaque cas à la référence : un temps ou une mémoire en hausse (ou un débit en baisse) de plus de
+    # `tolerance` (fraction), ou un taux de rejet en hausse de plus de `quality_tolerance` points, est une régression.
+    # Les écarts inférieurs à `floor` secondes sur un temps, ou à `call_floor` secondes par appel sur un débit,
+    # sont du bruit de mesure et ne comptent pas.
+    reference = {case_key(case): case for case in baseline['cases']}
+    rows = []
+    for case in cases:
+        before = reference.get(case_key(case))
+        if before is None:
+            continue
+        for key, direction in COMPARED:
+            old, new = before.get(key), case.get(key)
+            if old is None or new is None:
+                continue
+            if key == 'rejection_rate':
+                regressed = new - old > quality_tolerance
+            elif direction > 0:
+                regressed = new > old * (1 + tolerance) and (not key.endswith('_time') or new - old > floor)
+            else:
+                regressed = new < old / (1 + tolerance) and (new <= 0 or 1 / new - 1 / old > call_floor)
+            rows.append({'case': case_key(case), 'metric': key, 'baseline': old, 'current': new, 'regression': regressed})
+    return rows
+
+def format_comparison(rows):
+    lines = []
+    for row in rows:
+        pms, vms, density, _, _ = row['case']
+        flag = "RÉGRESSION" if row['regression'] else "ok"
+        lines.append(f"{pms:>5} PMs {vms:>8} VMs densité {density:<5} {row['metric']:<18} {row['baseline']:>12.4g} -> {row['current']:>12.4g}  {flag}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m vmplacement.benchmark", description="Mesure des performances et de la qualité du solveur sur des scénarios synthétiques")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--pms", type=int, nargs="+", help="nombres de PMs (remplace la grille du preset)")
+    parser.add_argument("--vms", type=int, nargs="+", help="nombres de VMs")
+    parser.add_argument("--densities", type=float, nargs="+", help="durée moyenne des VMs, en fraction de l'horizon")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=20, help="itérations taboues par cas")
+    parser.add_argument("--repeat", type=int, default=3, help="mesures par temps, la meilleure est retenue")
+    parser.add_argument("-o", "--output", help="fichier JSON des résultats (défaut : sortie standard)")
+    parser.add_argument("--compare", help="fichier JSON de référence : signale les régressions (code de sortie 1)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="écart relatif toléré sur les temps, débits et mémoire")
+    parser.add_argument("--quality-tolerance", type=float, default=0.5, help="hausse tolérée du taux de rejet, en points")
+    parser.add_argument("--floor", type=float, default=0.01, help="écart de temps ignoré (bruit), en secondes")
+    parser.add_argument("--call-floor", type=float, default=2e-6, help="écart de durée par appel ignoré sur les débits, en secondes")
+    args = parser.parse_args(argv)
+
+    grid = PRESETS[args.preset]
+    progress = lambda case: print(f"{case['pms']} PMs, {case['vms']} VMs, densité {case['density']}: "
+                                  f"{case['initial_time'] + case['tabu_time']:.2f}s, rejet {case['rejection_rate']:.2f}%", file=sys.stderr)
+    cases = run_grid(args.pms or grid['pms'], args.vms or grid['vms'], args.densities or grid['densities'],
+                     args.seed, args.iterations, repeat=args.repeat, progress=progress)
+    report = {'meta': metadata(), 'cases': cases}
+
+    if args.output:
+        with open(args.output, mode='w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if args.compare:
+        with open(args.compare, mode='r') as file:
+            rows = compare(cases, json.load(file), args.tolerance, args.quality_tolerance, args.floor, args.call_floor)
+        print(format_comparison(rows), file=sys.stderr)
+        if any(row['regression'] for row in rows):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from .model import as_pms, as_vms
+
+# À incrémenter à chaque modification du solveur qui change ses résultats : le cache est alors vidé
+SOLVER_VERSION = 3
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "vmplacement")
+# Valeurs par défaut de solve_scenario et tabu_search : un paramètre omis et sa valeur par défaut donnent la même clé
+DEFAULT_PARAMS = {'iterations': 100, 'tabu_size': 10, 'seed': 0, 'neighborhood_size': 32, 'strategy': 'arrival', 'starts': None, 'decompose': False}
+# Paramètres sans effet sur le placement (instrumentation), exclus de la clé
+UNKEYED_PARAMS = ('profile',)
+
+class ResultCache:
+    # Cache disque des résultats de solve_scenario (placement par PM et résumé d'utilisation), un fichier JSON
+    # par entrée. La clé est l'empreinte SHA-256 des PMs, des VMs, des paramètres du solveur et de sa version.
+    # L'éviction LRU repose sur la date de modification, rafraîchie à chaque lecture.
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=64 * 1024 * 1024, version=SOLVER_VERSION):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version
+        os.makedirs(directory, exist_ok=True)
+        marker = os.path.join(directory, "VERSION")
+        try:
+            with open(marker, mode='r') as file:
+                current = file.read().strip()
+        except FileNotFoundError:
+            current = None
+        if current != str(version):
+            self.clear()
+            with open(marker, mode='w') as file:
+                file.write(f"{version}\n")
+
+    def key(self, vms, pms, params):
+        digest = hashlib.sha256()
+        digest.update(f"v{self.version}\n".encode())
+        for table in (as_pms(pms), as_vms(vms)):
+            digest.update("\n".join(table.names).encode())
+            for column in table.columns:
+                digest.update(column.tobytes())
+        params = {name: value for name, value in params.items() if name not in UNKEYED_PARAMS and value is not None and value != DEFAULT_PARAMS.get(name)}
+        digest.update(json.dumps(params, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, mode='r') as file:
+                result = json.load(file)
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return result
+
+    def put(self, key, result):
+        # Écriture atomique (fichier temporaire puis renommage), puis éviction des entrées les moins récentes.
+        # Les mesures d'une résolution profilée (clé 'stats') ne sont pas conservées : elles ne valent que pour ce calcul.
+        result = {name: value for name, value in result.items() if name != 'stats'}
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, mode='w') as file:
+            json.dump(result, file)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        # Seuls les fichiers du cache sont supprimés : le dossier peut être partagé
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and (entry.name.endswith((".json", ".tmp")) or entry.name == "VERSION"):
+                os.remove(entry.path)
@@ -0,0 +1,194 @@
+import io
+import os
+
+from .workers import worker_pool, worker_task
+
+# Graphiques d'un résultat de solve_scenario, dessinés hors écran (Agg) : Figure et FigureCanvasAgg sans pyplot,
+# donc sans état global ni fenêtre, utilisables depuis un thread ou un processus de rendu.
+# Au-delà de MAX_BARS PMs, les PMs consécutives sont regroupées (moyenne, et étendue min-max) ;
+# les étiquettes de valeur ne sont écrites que jusqu'à LABEL_LIMIT barres.
+MAX_BARS = 60
+LABEL_LIMIT = 20
+RESOURCE_CHARTS = {
+    'cpu': ("Utilisation du CPU", 'CPU (%)', 'skyblue', 1),
+    'ram': ("Utilisation de la RAM", 'RAM (%)', 'lightgreen', 2),
+    'storage': ("Utilisation du Stockage", 'Stockage (%)', 'salmon', 3),
+}
+# Graphiques d'un scénario, dans l'ordre d'affichage : clé -> libellé
+SCENARIO_CHARTS = {'cpu': "CPU", 'ram': "RAM", 'storage': "Stockage", 'vms': "VMs", 'timeline': "Occupation"}
+
+def new_figure(figsize=(8, 5)):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+def aggregate(labels, values, limit=MAX_BARS):
+    # Regroupe les valeurs par paquets consécutifs pour ne pas dépasser `limit` points :
+    # (étiquettes, moyennes, minima, maxima), minima et maxima à None sans regroupement
+    if len(values) <= limit:
+        return list(labels), list(values), None, None
+    size = -(-len(values) // limit)
+    groups = [(start, min(start + size, len(values))) for start in range(0, len(values), size)]
+    names = [f"{labels[start]}…{labels[end - 1]}" for start, end in groups]
+    means = [sum(values[start:end]) / (end - start) for start, end in groups]
+    minima = [min(values[start:end]) for start, end in groups]
+    maxima = [max(values[start:end]) for start, end in groups]
+    return names, means, minima, maxima
+
+def _thin_ticks(ax, labels):
+    # Au plus ~20 graduations lisibles sur l'axe des x
+    step = max(1, -(-len(labels) // 20))
+    positions = list(range(0, len(labels), step))
+    ax.set_xticks(positions)
+    ax.set_xticklabels([labels[k] for k in positions], rotation=45 if len(labels) > 10 else 0, ha='right' if len(labels) > 10 else 'center', fontsize=8)
+
+def resource_figure(result, resource, pms=None):
+    title, ylabel, color, column = RESOURCE_CHARTS[resource]
+    resource_usage = result['resource_usage']
+    names = list(resource_usage)
+    usage = [resource_usage[name][resource] for name in names]
+    labels, values, minima, maxima = aggregate(names, usage)
+    positions = range(len(values))
+
+    fig = new_figure()
+    ax = fig.add_subplot()
+    ax.set_title(f"Scénario {result['scenario']} - {title}", fontsize=14)
+    if minima is None:
+        bars = ax.bar(positions, values, color=color, label='Utilisation')
+    else:
+        spread = [[v - low for v, low in zip(values, minima)], [high - v for v, high in zip(values, maxima)]]
+        bars = ax.bar(positions, values, color=color, yerr=spread, ecolor='gray', capsize=2, label="Moyenne par groupe de PMs (min-max)")
+    ax.bar(positions, [100] * len(values), color='none', edgecolor='gray', linewidth=2, alpha=0.5, label='Capacité max')
+    ax.set_ylabel(ylabel)
+    ax.legend()
+    _thin_ticks(ax, labels)
+
+    if minima is None and len(values) <= LABEL_LIMIT:
+        capacity = {pm[0]: pm[column] for pm in pms} if pms is not None else {}
+        texts = []
+        for name, value in zip(names, usage):
+            used = resource_usage[name][f'used_{resource}']
+            texts.append(f"{value:.1f}%\n({used}/{capacity[name]})" if name in capacity else f"{value:.1f}%\n({used})")
+        ax.bar_label(bars, labels=texts, label_type='center')
+    fig.tight_layout()
+    return fig
+
+def vm_count_figure(result):
+    resource_usage = result['resource_usage']
+    names = list(resource_usage)
+    counts = [len(resource_usage[name]['vms']) for name in names]
+    labels, values, minima, maxima = aggregate(names, counts)
+    positions = range(len(values))
+
+    fig = new_figure()
+    ax = fig.add_subplot()
+    ax.set_title(f"Scénario {result['scenario']} - Nombre de VMs", fontsize=14)
+    ax.plot(positions, values, 'o-', color='purple')
+    if minima is not None:
+        ax.fill_between(positions, minima, maxima, color='purple', alpha=0.15, label='min-max par groupe de PMs')
+        ax.legend()
+    elif len(values) <= LABEL_LIMIT:
+        for x, y in zip(positions, values):
+            ax.text(x, y, str(y), ha='center', va='bottom')
+    ax.set_ylabel('Nombre de VMs')
+    _thin_ticks(ax, labels)
+    fig.tight_layout()
+    return fig
+
+def timeline_figure(result):
+    timeline = result.get('timeline')
+    fig = new_figure(figsize=(10, 5))
+    ax = fig.add_subplot()
+    ax.set_title(f"Scénario {result['scenario']} - Occupation de la flotte dans la journée", fontsize=14)
+    if not timeline:
+        ax.text(0.5, 0.5, "Indisponible (NumPy requis)", ha='center', va='center', transform=ax.transAxes)
+        return fig
+    bucket = timeline['bucket']
+    minutes = [k * bucket for k in range(len(timeline['cpu']))]
+    ax.step(minutes, timeline['cpu'], where='post', color='skyblue', label='CPU')
+    ax.step(minutes, timeline['ram'], where='post', color='lightgreen', label='RAM')
+    ax.step(minutes, timeline['storage'], where='post', color='salmon', label='Stockage')
+    ax.set_xlabel(f"Minute (tranches de {bucket} min)")
+    ax.set_ylabel("Occupation (%)")
+    ax.set_ylim(0, 100)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+def rejection_figure(rejection_rates, scenarios=None):
+    scenarios = list(scenarios) if scenarios is not None else list(range(1, len(rejection_rates) + 1))
+    fig = new_figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    ax.set_title("Taux de rejet par scénario", fontsize=16)
+    positions = range(len(rejection_rates))
+    bars = ax.bar(positions, rejection_rates, color='red', alpha=0.7)
+    if len(rejection_rates) <= LABEL_LIMIT:
+        ax.bar_label(bars, labels=[f"{rate:.1f}%" for rate in rejection_rates], padding=2)
+    ax.set_xlabel("Scénario")
+    ax.set_ylabel("Taux de rejet (%)")
+    _thin_ticks(ax, [str(num) for num in scenarios])
+    ax.set_ylim(0, 100)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    if rejection_rates:
+        average = sum(rejection_rates) / len(rejection_rates)
+        ax.axhline(y=average, color='blue', linestyle='--', label=f"Moyenne: {average:.1f}%")
+        ax.legend()
+    fig.tight_layout()
+    return fig
+
+def scenario_figure(result, kind, pms=None):
+    # kind : une clé de SCENARIO_CHARTS
+    if kind in RESOURCE_CHARTS:
+        return resource_figure(result, kind, pms)
+    if kind == 'vms':
+        return vm_count_figure(result)
+    if kind == 'timeline':
+        return timeline_figure(result)
+    raise ValueError(f"Graphique inconnu : {kind}")
+
+def render(fig, format='png', dpi=100):
+    # Image encodée (octets). Sans pyplot, aucune figure n'est retenue : la mémoire est rendue avec la figure.
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=format, dpi=dpi)
+    return buffer.getvalue()
+
+def export_scenario(result, folder, pms=None, formats=('png', 'svg'), dpi=100):
+    # Écrit scenario_N_<graphique>.<format> pour chaque graphique du scénario ; renvoie les chemins
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for kind in SCENARIO_CHARTS:
+        fig = scenario_figure(result, kind, pms)
+        for format in formats:
+            path = os.path.join(folder, f"scenario_{result['scenario']}_{kind}.{format}")
+            with open(path, mode='wb') as file:
+                file.write(render(fig, format, dpi))
+            paths.append(path)
+    return paths
+
+def _export_one(result, folder, formats, dpi, pms=None):
+    return export_scenario(result, folder, pms, formats, dpi)
+
+def export_results(results, folder, pms=None, formats=('png', 'svg'), workers=1, dpi=100):
+    # Export par lots de tous les scénarios, plus le taux de rejet ; workers != 1 : pool de processus
+    # (None = tous les cœurs). Renvoie les chemins écrits.
+    results = list(results)
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    if workers == 1:
+        for result in results:
+            paths.extend(export_scenario(result, folder, pms, formats, dpi))
+    else:
+        with worker_pool(workers, pms=pms) as executor:
+            for written in executor.map(worker_task(_export_one), results, [folder] * len(results), [formats] * len(results), [dpi] * len(results)):
+                paths.extend(written)
+    if results:
+        fig = rejection_figure([result['rejection_rate'] for result in results], [result['scenario'] for result in results])
+        for format in formats:
+            path = os.path.join(folder, f"rejet.{format}")
+            with open(path, mode='wb') as file:
+                file.write(render(fig, format, dpi))
+            paths.append(path)
+    return paths
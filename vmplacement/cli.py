@@ -0,0 +1,79 @@
+import argparse
+import csv
+import json
+import sys
+
+from .cache import ResultCache
+from .runner import global_summary, solve_folder, sorted_results
+from .scenarios import pm_file, read_machines
+from .stats import collapsed_stacks
+
+SUMMARY_FIELDS = ['scenario', 'total_vms', 'placed', 'rejected', 'rejection_rate', 'avg_cpu', 'avg_ram', 'avg_storage']
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m vmplacement", description="Placement de VMs pré-planifiées par recherche taboue (sans interface graphique)")
+    parser.add_argument("folder", help="dossier contenant machines_physiques.txt et machines_virtuelles_N.txt")
+    parser.add_argument("-f", "--format", choices=["json", "csv"], default="json", help="format de sortie (défaut : json)")
+    parser.add_argument("-o", "--output", help="fichier de sortie (défaut : sortie standard)")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--tabu-size", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=None, help="budget en secondes par scénario")
+    parser.add_argument("--stagnation", type=int, default=None, help="arrêt après N itérations sans amélioration")
+    parser.add_argument("--starts", type=int, default=None, help="recherches parallèles par scénario, depuis des placements initiaux différents")
+    parser.add_argument("--decompose", action="store_true", help="résout séparément les blocs de VMs sans recouvrement temporel")
+    parser.add_argument("--cache-dir", default=None, help="cache disque des résultats (désactivé par défaut)")
+    parser.add_argument("--profile", action="store_true", help="ajoute au rapport JSON les compteurs, temps par phase et trace de chaque recherche")
+    parser.add_argument("--flame", default=None, help="écrit le profil des recherches au format piles repliées (flamegraph.pl, speedscope)")
+    parser.add_argument("--charts", default=None, help="dossier où exporter les graphiques de chaque scénario (matplotlib requis)")
+    parser.add_argument("--chart-format", nargs="+", choices=["png", "svg", "pdf"], default=["png"], help="formats des graphiques exportés")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="processus de calcul en parallèle (0 : tous les cœurs)")
+    return parser
+
+def write_json(results, params, file):
+    json.dump({'parameters': params, 'scenarios': results, 'global': global_summary(results)}, file, indent=2)
+    file.write("\n")
+
+def write_csv(results, file):
+    writer = csv.DictWriter(file, fieldnames=SUMMARY_FIELDS, extrasaction='ignore', lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(results)
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    params = {
+        'iterations': args.iterations,
+        'tabu_size': args.tabu_size,
+        'seed': args.seed,
+        'time_limit': args.time_limit,
+        'stagnation': args.stagnation,
+        'starts': args.starts,
+        'decompose': args.decompose,
+        'profile': args.profile or args.flame is not None,
+    }
+    
+    workers = args.workers or None
+    cache = ResultCache(args.cache_dir) if args.cache_dir else None
+    results = sorted_results(solve_folder(args.folder, workers, cache=cache, **params))
+    
+    file = open(args.output, mode='w', newline='') if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            write_csv(results, file)
+        else:
+            write_json(results, params, file)
+    finally:
+        if file is not sys.stdout:
+            file.close()
+    
+    if args.flame:
+        with open(args.flame, mode='w') as file:
+            for result in results:
+                if 'stats' in result:
+                    file.write(collapsed_stacks(result['stats']['timers'], f"scenario_{result['scenario']}") + "\n")
+    
+    if args.charts:
+        # Rendu hors écran, réparti sur les mêmes processus que le calcul
+        from .charts import export_results
+        export_results(results, args.charts, read_machines(pm_file(args.folder), is_vm=False), args.chart_format, workers)
+    return 0
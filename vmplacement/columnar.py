@@ -0,0 +1,113 @@
+import argparse
+import os
+
+import numpy as np
+
+from .scenarios import list_scenario_files, pm_file
+
+# Format binaire en colonnes : un tableau structuré NumPy (.npy, entiers 32 bits) par fichier,
+# plus une table des noms (*.names.npy, chaînes de largeur fixe) indexée par le champ `id`.
+# Les deux fichiers se chargent en memory-map, sans copie ni analyse de texte.
+PM_DTYPE = np.dtype([('id', '<i4'), ('cpu', '<i4'), ('ram', '<i4'), ('storage', '<i4')])
+VM_DTYPE = np.dtype(PM_DTYPE.descr + [('arrival', '<i4'), ('departure', '<i4')])
+
+def names_path(path):
+    return os.path.splitext(path)[0] + ".names.npy"
+
+def _records(values, first_id, dtype):
+    records = np.empty(len(values), dtype=dtype)
+    records['id'] = np.arange(first_id, first_id + len(values))
+    columns = np.array(values, dtype=np.int64).reshape(len(values), len(dtype.names) - 1)
+    for k, field in enumerate(dtype.names[1:]):
+        records[field] = columns[:, k]
+    return records
+
+def to_columnar(machines, is_vm=False):
+    # Adaptateur depuis l'ancien format en listes
+    dtype = VM_DTYPE if is_vm else PM_DTYPE
+    records = _records([machine[1:] for machine in machines], 0, dtype)
+    names = np.array([machine[0] for machine in machines], dtype=str)
+    return records, names
+
+def to_machines(records, names):
+    # Adaptateur vers l'ancien format en listes
+    names = names.tolist()
+    columns = [records[field].tolist() for field in records.dtype.names[1:]]
+    return [[names[i], *row] for i, row in zip(records['id'].tolist(), zip(*columns))]
+
+def save_columnar(path, machines, is_vm=False):
+    records, names = to_columnar(machines, is_vm)
+    np.save(path, records)
+    np.save(names_path(path), names)
+
+def load_columnar(path, mmap=True):
+    # Renvoie (colonnes, noms) ; avec mmap, les données restent sur disque et sont lues à la demande
+    mode = 'r' if mmap else None
+    return np.load(path, mmap_mode=mode), np.load(names_path(path), mmap_mode=mode)
+
+def iter_txt(filename, is_vm=False, chunk=65536):
+    # Lecture en flux d'un fichier texte historique, par blocs (colonnes, noms) d'au plus `chunk` lignes
+    dtype = VM_DTYPE if is_vm else PM_DTYPE
+    width = len(dtype.names)
+    first_id = 0
+    names = []
+    values = []
+    with open(filename, mode='r') as file:
+        for line in file:
+            parts = line.split()
+            if not parts:
+                continue
+            names.append(parts[0])
+            values.append(parts[1:width])
+            if len(names) >= chunk:
+                yield _records(values, first_id, dtype), names
+                first_id += len(names)
+                names, values = [], []
+    if names:
+        yield _records(values, first_id, dtype), names
+
+def convert_txt(filename, output=None, is_vm=False, chunk=65536):
+    # Conversion texte -> .npy en mémoire bornée : un premier passage compte les lignes et mesure les noms,
+    # le second remplit les fichiers de sortie ouverts en memory-map
+    output = output or os.path.splitext(filename)[0] + ".npy"
+    count = width = 0
+    with open(filename, mode='r') as file:
+        for line in file:
+            parts = line.split(None, 1)
+            if parts:
+                count += 1
+                width = max(width, len(parts[0]))
+    
+    dtype = VM_DTYPE if is_vm else PM_DTYPE
+    records = np.lib.format.open_memmap(output, mode='w+', dtype=dtype, shape=(count,))
+    names = np.lib.format.open_memmap(names_path(output), mode='w+', dtype=f'<U{max(width, 1)}', shape=(count,))
+    offset = 0
+    for chunk_records, chunk_names in iter_txt(filename, is_vm, chunk):
+        records[offset:offset + len(chunk_records)] = chunk_records
+        names[offset:offset + len(chunk_names)] = chunk_names
+        offset += len(chunk_records)
+    records.flush()
+    names.flush()
+    return output
+
+def convert_folder(folder="."):
+    # Convertit machines_physiques.txt et les machines_virtuelles_N.txt qui n'ont pas de .npy à jour
+    converted = []
+    pm_path = pm_file(folder)
+    if pm_path.endswith(".txt") and os.path.exists(pm_path):
+        converted.append(convert_txt(pm_path, is_vm=False))
+    for num, path in list_scenario_files(folder):
+        if path.endswith(".txt"):
+            converted.append(convert_txt(path, is_vm=True))
+    return converted
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m vmplacement.columnar", description="Conversion des scénarios texte au format binaire .npy")
+    parser.add_argument("folder", help="dossier contenant machines_physiques.txt et machines_virtuelles_N.txt")
+    args = parser.parse_args(argv)
+    for path in convert_folder(args.folder):
+        print(path)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
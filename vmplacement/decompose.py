@@ -0,0 +1,60 @@
+import os
+
+from .model import as_pms, as_vms
+from .occupancy import np
+from .placement import Placement
+from .search import tabu_search
+from .workers import worker_pool, worker_task
+
+def time_blocks(vms):
+    # Composantes connexes du graphe de recouvrement des intervalles [arrivée, départ) : après tri par arrivée,
+    # un bloc se termine dès qu'une VM arrive au départ (ou après le départ) de toutes les précédentes.
+    # Renvoie les blocs (listes d'identifiants de VMs) dans l'ordre chronologique.
+    vms = as_vms(vms)
+    arrival, departure = vms.column('arrival'), vms.column('departure')
+    if np is not None:
+        arrival = np.frombuffer(arrival, dtype=np.intc)
+        departure = np.frombuffer(departure, dtype=np.intc)
+        order = np.argsort(arrival, kind='stable')
+        reach = np.maximum.accumulate(departure[order])
+        cuts = np.flatnonzero(arrival[order][1:] >= reach[:-1]) + 1
+        return [block.tolist() for block in np.split(order, cuts) if len(block)]
+    
+    blocks = []
+    reach = None
+    for v in sorted(range(len(vms)), key=arrival.__getitem__):
+        if reach is None or arrival[v] >= reach:
+            blocks.append([])
+            reach = departure[v]
+        blocks[-1].append(v)
+        reach = max(reach, departure[v])
+    return blocks
+
+def _solve_block(vms, params, pms):
+    best_solution, _, _ = tabu_search(vms, pms, **params)
+    return best_solution.location.tolist()
+
+def decomposed_search(vms, pms, workers=1, time_limit=None, stop=None, **params):
+    # Résout chaque bloc indépendamment (les blocs n'ont aucun instant commun, leurs placements ne peuvent pas
+    # entrer en conflit) puis fusionne les placements. Les paramètres s'appliquent à chaque bloc ; time_limit
+    # est réparti au prorata du nombre de VMs. Avec workers != 1, les blocs sont répartis dans un pool de
+    # processus (stop ne s'applique alors pas). Renvoie (solution, VMs non placées, score).
+    vms, pms = as_vms(vms), as_pms(pms)
+    blocks = time_blocks(vms)
+    subproblems = [vms.subset(block) for block in blocks]
+    budgets = [None if time_limit is None else time_limit * len(block) / len(vms) for block in blocks]
+    
+    if workers == 1:
+        locations = [_solve_block(sub, dict(params, time_limit=budget, stop=stop), pms) for sub, budget in zip(subproblems, budgets)]
+    else:
+        # Lots de blocs par tâche : les petits blocs ne paient pas chacun un aller-retour vers le pool
+        chunksize = max(1, len(blocks) // (4 * (workers or os.cpu_count() or 1)))
+        with worker_pool(workers, pms=pms) as executor:
+            locations = list(executor.map(worker_task(_solve_block), subproblems, [dict(params, time_limit=budget) for budget in budgets], chunksize=chunksize))
+    
+    placement = Placement(pms, vms)
+    for block, location in zip(blocks, locations):
+        for v, pm_id in zip(block, location):
+            if pm_id >= 0:
+                placement.assign(v, pm_id)
+    return placement, placement.unplaced_vms(), placement.score()
@@ -0,0 +1,120 @@
+import argparse
+import os
+
+import numpy as np
+
+from .columnar import PM_DTYPE, VM_DTYPE, names_path
+from .occupancy import HORIZON
+from .scenarios import PM_FILENAME
+
+# Lois de tirage : une loi est un appelable (rng, taille) -> tableau d'entiers. La durée reçoit à la place
+# le tableau des arrivées, (rng, arrivées) -> durées, pour pouvoir dépendre de l'heure d'arrivée.
+def uniform(low, high):
+    # Entiers uniformes sur [low, high], bornes comprises (comme random.randint)
+    return lambda rng, size: rng.integers(low, high + 1, size=size)
+
+def exponential(mean, low=0, high=None):
+    return lambda rng, size: np.clip(np.rint(rng.exponential(mean, size=size)), low, high).astype(np.int64)
+
+def normal(mean, std, low=0, high=None):
+    return lambda rng, size: np.clip(np.rint(rng.normal(mean, std, size=size)), low, high).astype(np.int64)
+
+def choice(values, weights=None):
+    values = np.asarray(values)
+    p = None if weights is None else np.asarray(weights, dtype=float) / sum(weights)
+    return lambda rng, size: rng.choice(values, size=size, p=p)
+
+def until_horizon(horizon=HORIZON):
+    # Départ uniforme entre l'arrivée et la fin de l'horizon (comportement de generate_machines)
+    return lambda rng, arrival: rng.integers(0, horizon - arrival + 1)
+
+def duration(law, horizon=HORIZON):
+    # Durée indépendante de l'arrivée, tronquée à la fin de l'horizon
+    return lambda rng, arrival: np.clip(law(rng, len(arrival)), 0, horizon - arrival)
+
+# Profils par défaut : mêmes plages uniformes que generate_machines
+PM_PROFILE = {'cpu': uniform(16, 32), 'ram': uniform(32, 128), 'storage': uniform(500, 1000)}
+VM_PROFILE = {'cpu': uniform(1, 8), 'ram': uniform(1, 32), 'storage': uniform(10, 200),
+              'arrival': uniform(0, HORIZON), 'duration': until_horizon()}
+
+def _streams(seed, fields):
+    # Un générateur indépendant par champ : le résultat ne dépend pas de la taille des blocs
+    sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return dict(zip(fields, (np.random.default_rng(child) for child in sequence.spawn(len(fields)))))
+
+def vm_batches(count, seed=0, profile=VM_PROFILE, chunk=1_000_000, prefix="VM"):
+    # Produit les VMs par blocs (colonnes au format VM_DTYPE, noms prefix_1, prefix_2, ...) sans jamais
+    # matérialiser l'ensemble ; même graine et même profil donnent les mêmes VMs quel que soit `chunk`.
+    profile = {**VM_PROFILE, **profile}
+    streams = _streams(seed, ['cpu', 'ram', 'storage', 'arrival', 'duration'])
+    for offset in range(0, count, chunk):
+        size = min(chunk, count - offset)
+        records = np.empty(size, dtype=VM_DTYPE)
+        records['id'] = np.arange(offset, offset + size)
+        for field in ('cpu', 'ram', 'storage', 'arrival'):
+            records[field] = profile[field](streams[field], size)
+        records['departure'] = records['arrival'] + profile['duration'](streams['duration'], records['arrival'].astype(np.int64))
+        names = np.char.add(f"{prefix}_", np.arange(offset + 1, offset + size + 1).astype(str))
+        yield records, names
+
+def pm_records(count, seed=0, profile=PM_PROFILE, prefix="PM"):
+    profile = {**PM_PROFILE, **profile}
+    streams = _streams(seed, ['cpu', 'ram', 'storage'])
+    records = np.empty(count, dtype=PM_DTYPE)
+    records['id'] = np.arange(count)
+    for field in ('cpu', 'ram', 'storage'):
+        records[field] = profile[field](streams[field], count)
+    return records, np.char.add(f"{prefix}_", np.arange(1, count + 1).astype(str))
+
+def write_batches(path, batches, count, dtype, width):
+    # Écrit des blocs (colonnes, noms) dans un .npy (memory-map préalloué de `count` lignes, noms d'au plus
+    # `width` caractères) ou un .txt (ajout bloc par bloc)
+    if path.endswith(".npy"):
+        if count == 0:
+            np.save(path, np.empty(0, dtype=dtype))
+            np.save(names_path(path), np.empty(0, dtype=f'<U{width}'))
+            return path
+        records = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(count,))
+        names = np.lib.format.open_memmap(names_path(path), mode='w+', dtype=f'<U{width}', shape=(count,))
+        offset = 0
+        for chunk_records, chunk_names in batches:
+            records[offset:offset + len(chunk_records)] = chunk_records
+            names[offset:offset + len(chunk_names)] = chunk_names
+            offset += len(chunk_records)
+        records.flush()
+        names.flush()
+        return path
+
+    with open(path, mode='w') as file:
+        for chunk_records, chunk_names in batches:
+            columns = [chunk_records[field].tolist() for field in chunk_records.dtype.names[1:]]
+            file.writelines(" ".join(map(str, row)) + "\n" for row in zip(chunk_names.tolist(), *columns))
+    return path
+
+def generate_folder(folder, n_pms, vm_counts, seed=0, pm_profile=PM_PROFILE, vm_profile=VM_PROFILE, format="npy", chunk=1_000_000):
+    # Écrit machines_physiques et un fichier machines_virtuelles_N par scénario (VM_N_1, VM_N_2, ...),
+    # en flux ; vm_counts : nombre de VMs de chaque scénario. Renvoie les chemins écrits.
+    os.makedirs(folder, exist_ok=True)
+    pm_seed, *vm_seeds = np.random.SeedSequence(seed).spawn(1 + len(vm_counts))
+    base = os.path.splitext(PM_FILENAME)[0]
+    paths = [write_batches(os.path.join(folder, f"{base}.{format}"), [pm_records(n_pms, pm_seed, pm_profile)], n_pms, PM_DTYPE, len(f"PM_{n_pms}"))]
+    for idx, (count, vm_seed) in enumerate(zip(vm_counts, vm_seeds), start=1):
+        path = os.path.join(folder, f"machines_virtuelles_{idx}.{format}")
+        paths.append(write_batches(path, vm_batches(count, vm_seed, vm_profile, chunk, prefix=f"VM_{idx}"), count, VM_DTYPE, len(f"VM_{idx}_{count}")))
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m vmplacement.generator", description="Génération reproductible de scénarios, écrits en flux")
+    parser.add_argument("folder", help="dossier de sortie")
+    parser.add_argument("--pms", type=int, default=10, help="nombre de machines physiques")
+    parser.add_argument("--vms", type=int, nargs="+", default=[100], help="nombre de VMs de chaque scénario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=["npy", "txt"], default="npy")
+    parser.add_argument("--chunk", type=int, default=1_000_000, help="VMs générées et écrites par bloc")
+    args = parser.parse_args(argv)
+    for path in generate_folder(args.folder, args.pms, args.vms, args.seed, format=args.format, chunk=args.chunk):
+        print(path)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
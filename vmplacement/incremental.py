@@ -0,0 +1,137 @@
+from bisect import bisect_left
+
+from .model import VMTable, as_pms
+from .occupancy import HORIZON, make_occupancy
+from .placement import Placement
+from .search import tabu_search_iter
+
+def apply_diff(previous, added=(), removed=(), changed=(), pms=None):
+    # Reconstruit un placement à partir du précédent et d'un diff, sans repartir de zéro :
+    #   added : nouvelles VMs (listes) ; removed : noms des VMs annulées ; changed : VMs modifiées (même nom) ;
+    #   pms : nouvelle flotte (capacités modifiées, PMs ajoutées ou retirées, reconnues par leur nom).
+    # Les affectations conservées sont rechargées en bloc ; seules les PMs dont une capacité baisse sont
+    # revérifiées. Renvoie (placement avec occupation, identifiants des VMs à replacer, fenêtres libérées) :
+    # les VMs à replacer sont les ajoutées, les modifiées (même rejetées auparavant) et les évincées (les autres
+    # VMs déjà rejetées restent non placées) ; les fenêtres libérées sont, par PM, les intervalles [début, fin) disjoints et triés où
+    # le diff y rend de la place (VMs annulées, modifiées ou évincées ; tout l'horizon d'une PM ajoutée ou agrandie).
+    old_vms, old_pms = previous.vms, previous.pms
+    pms = old_pms if pms is None else as_pms(pms)
+    index = {name: k for k, name in enumerate(old_vms.names)}
+    removed = set(removed)
+    changed = {vm[0]: vm for vm in changed}
+    for name in [*removed, *changed]:
+        if name not in index:
+            raise ValueError(f"VM inconnue : {name}")
+    for vm in added:
+        if vm[0] in index and vm[0] not in removed:
+            raise ValueError(f"VM déjà présente : {vm[0]}")
+
+    kept = [k for k, name in enumerate(old_vms.names) if name not in removed]
+    rows = [changed.get(old_vms.names[k]) or [old_vms.names[k], *old_vms[k][1:]] for k in kept]
+    vms = VMTable.from_lists(rows + list(added))
+
+    # Correspondance des PMs par nom ; une PM dont une capacité baisse doit être revérifiée
+    pm_index = {name: j for j, name in enumerate(pms.names)}
+    pm_map = [pm_index.get(name, -1) for name in old_pms.names]
+    shrunk = {j for old, j in enumerate(pm_map) if j >= 0 and any(new < before for new, before in zip(pms[j][1:], old_pms[old][1:]))}
+    old_index = {name: old for old, name in enumerate(old_pms.names)}
+    grown = [j for j, name in enumerate(pms.names) if name not in old_index or any(new > before for new, before in zip(pms[j][1:], old_pms[old_index[name]][1:]))]
+    freed = {j: [(0, HORIZON)] for j in grown}
+    for name in [*removed, *changed]:
+        old_id = index[name]
+        old_pm = previous.location[old_id]
+        if old_pm >= 0 and pm_map[old_pm] >= 0:
+            freed.setdefault(pm_map[old_pm], []).append(old_vms[old_id][4:6])
+
+    placement = Placement(pms, vms)
+    displaced = []
+    pending = []
+    for new_id, old_id in enumerate(kept):
+        old_pm = previous.location[old_id]
+        if old_vms.names[old_id] in changed:
+            displaced.append(new_id)
+            continue
+        if old_pm < 0:
+            continue
+        j = pm_map[old_pm]
+        if j < 0:
+            displaced.append(new_id)
+        elif j in shrunk:
+            pending.append((new_id, j))
+        else:
+            placement.assign(new_id, j)
+    displaced.extend(range(len(kept), len(vms)))
+
+    occupancy = make_occupancy(pms)
+    assigned = [v for v in range(len(vms)) if placement.location[v] >= 0]
+    occupancy.add_many([placement.location[v] for v in assigned], [vms[v] for v in assigned])
+    placement.occupancy = occupancy
+    for new_id, j in pending:
+        if occupancy.fits(j, vms[new_id]):
+            placement.assign(new_id, j)
+        else:
+            displaced.append(new_id)
+            freed.setdefault(j, []).append(vms[new_id][4:6])
+
+    return placement, displaced, {j: merge_windows(windows) for j, windows in freed.items()}
+
+def merge_windows(windows):
+    # Intervalles [début, fin) fusionnés en intervalles disjoints et triés
+    merged = []
+    for start, end in sorted(windows):
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def overlaps_any(arrival, departure, windows, starts):
+    # windows : intervalles disjoints et triés, starts : leurs débuts
+    k = bisect_left(starts, departure) - 1
+    return k >= 0 and windows[k][1] > arrival
+
+def incremental_search(previous, added=(), removed=(), changed=(), pms=None, iterations=20, stagnation=10, **params):
+    # Ré-optimisation après un diff, limitée aux VMs et aux PMs qu'il concerne. Réparation gloutonne des VMs à
+    # replacer (ordre d'arrivée, première PM faisable) ; une VM déjà rejetée n'est reprise que si sa fenêtre
+    # recoupe une fenêtre libérée, et seulement sur la PM concernée (ailleurs, rien n'a changé pour elle).
+    # Courte recherche taboue ensuite, dont les seuls candidats à l'insertion sont ces VMs.
+    # Renvoie (solution, VMs non placées, score).
+    placement, displaced, freed = apply_diff(previous, added, removed, changed, pms)
+    vms, occupancy = placement.vms, placement.occupancy
+    arrival, departure = vms.column('arrival'), vms.column('departure')
+    for vm_id in sorted(displaced, key=arrival.__getitem__):
+        i = occupancy.first_fit(vms[vm_id])
+        if i >= 0:
+            placement.assign(vm_id, i)
+
+    windows = [(j, spans, [start for start, _ in spans]) for j, spans in freed.items()]
+    displaced = set(displaced)
+    targets = {}
+    for vm_id in sorted(placement.unplaced, key=arrival.__getitem__):
+        if vm_id not in displaced:
+            overlapping = [j for j, spans, starts in windows if overlaps_any(arrival[vm_id], departure[vm_id], spans, starts)]
+            if overlapping:
+                targets[vm_id] = overlapping
+
+    # Tests groupés par PM ; une PM qui a reçu une VM depuis est revérifiée (l'occupation ne fait que croître :
+    # un refus reste valable)
+    fitting = set()
+    for j, _, _ in windows:
+        ids = [vm_id for vm_id, overlapping in targets.items() if j in overlapping]
+        fitting.update((vm_id, j) for vm_id, ok in zip(ids, occupancy.fits_many(j, [vms[vm_id] for vm_id in ids])) if ok)
+    filled = set()
+    for vm_id, overlapping in targets.items():
+        for j in overlapping:
+            if (vm_id, j) in fitting and (j not in filled or occupancy.fits(j, vms[vm_id])):
+                placement.assign(vm_id, j)
+                filled.add(j)
+                break
+
+    # Seuls les candidats peuvent encore être insérés : la recherche s'arrête lorsqu'ils sont tous placés
+    candidates = [vm_id for vm_id in [*sorted(displaced), *targets] if placement.location[vm_id] < 0]
+    upper_bound = placement.score() + len(candidates)
+    for best_solution, best_score in tabu_search_iter(vms, placement.pms, iterations, stagnation=stagnation, upper_bound=upper_bound, start=placement, candidates=candidates, **params):
+        pass
+    return best_solution, best_solution.unplaced_vms(), best_score
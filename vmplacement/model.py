@@ -0,0 +1,91 @@
+from array import array
+from collections.abc import Sequence
+
+class MachineTable:
+    # Struct-of-arrays : une colonne d'entiers 32 bits par champ, indexée par un identifiant dense 0..n-1.
+    # Les noms sont dans une table à part. Une ligne se lit comme l'ancienne liste,
+    # l'identifiant entier remplaçant le nom : (id, cpu, ram, storage[, arrival, departure]).
+    __slots__ = ('names', 'columns')
+    FIELDS = ()
+
+    def __init__(self, names, columns):
+        self.names = names
+        self.columns = columns
+
+    @classmethod
+    def from_lists(cls, machines):
+        # Adaptateur depuis l'ancien format en listes
+        names = [machine[0] for machine in machines]
+        columns = tuple(array('i', [machine[k] for machine in machines]) for k in range(1, len(cls.FIELDS) + 1))
+        return cls(names, columns)
+
+    @classmethod
+    def from_records(cls, records, names):
+        # Adaptateur depuis le format binaire en colonnes (tableau structuré NumPy + table des noms)
+        # Les noms restent dans la table memory-map et ne sont lus qu'à la demande ; les colonnes d'entiers sont
+        # recopiées en array('i') (un passage par champ) pour garder un accès scalaire rapide dans la recherche
+        import numpy as np
+        columns = []
+        for field in cls.FIELDS:
+            column = array('i')
+            column.frombytes(memoryview(np.ascontiguousarray(records[field], dtype=np.intc)).cast('B'))
+            columns.append(column)
+        return cls(NameTable(names, records['id']), tuple(columns))
+
+    def to_lists(self):
+        # Adaptateur vers l'ancien format en listes
+        return [[self.names[i], *row] for i, row in enumerate(zip(*self.columns))]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i):
+        return (i, *(column[i] for column in self.columns))
+
+    def __iter__(self):
+        for i, row in enumerate(zip(*self.columns)):
+            yield (i, *row)
+
+    def column(self, field):
+        return self.columns[self.FIELDS.index(field)]
+
+    def subset(self, ids):
+        # Sous-table renumérotée 0..len(ids)-1, dans l'ordre de ids
+        return type(self)([self.names[i] for i in ids], tuple(array('i', [column[i] for i in ids]) for column in self.columns))
+
+class NameTable(Sequence):
+    # Vue en lecture seule sur la table des noms du format en colonnes : le nom de la ligne i est names[ids[i]],
+    # décodé à l'accès, sans copie de la table entière au chargement
+    __slots__ = ('names', 'ids')
+    CHUNK = 65536
+
+    def __init__(self, names, ids):
+        self.names = names
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.names[self.ids[i]].tolist()
+        return str(self.names[self.ids[i]])
+
+    def __iter__(self):
+        # Parcours par blocs : une conversion NumPy par bloc plutôt qu'un accès par nom
+        for start in range(0, len(self.ids), self.CHUNK):
+            yield from self.names[self.ids[start:start + self.CHUNK]].tolist()
+
+class PMTable(MachineTable):
+    __slots__ = ()
+    FIELDS = ('cpu', 'ram', 'storage')
+
+class VMTable(MachineTable):
+    __slots__ = ()
+    FIELDS = ('cpu', 'ram', 'storage', 'arrival', 'departure')
+
+def as_pms(pms):
+    return pms if isinstance(pms, PMTable) else PMTable.from_lists(pms)
+
+def as_vms(vms):
+    return vms if isinstance(vms, VMTable) else VMTable.from_lists(vms)
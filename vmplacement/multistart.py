@@ -0,0 +1,89 @@
+import multiprocessing
+import os
+import time
+
+from .model import as_pms, as_vms
+from .search import INITIAL_STRATEGIES, placement_upper_bound, tabu_search_iter
+from .workers import worker_pool, worker_task
+
+def _publish(incumbent, score):
+    with incumbent.get_lock():
+        if score > incumbent.value:
+            incumbent.value = score
+
+def _run_start(worker, vms, pms, strategy, seed, upper_bound, time_limit, sync_every, max_restarts, params, incumbent):
+    # incumbent : meilleur score connu, partagé par tous les processus du pool
+    started = time.perf_counter()
+    deadline = None if time_limit is None else started + time_limit
+    stats = {'worker': worker, 'strategy': strategy, 'seed': seed, 'initial_score': None, 'best_score': -1,
+             'improvements': 0, 'iterations': 0, 'restarts': 0}
+    best_solution = None
+    run_strategy, run_seed = strategy, seed
+    
+    while True:
+        pruned = False
+        
+        def stop(best_score, since_improvement):
+            # Toutes les sync_every itérations, comparaison avec le meilleur score des autres processus
+            nonlocal pruned
+            stats['iterations'] += 1
+            if stats['iterations'] % sync_every:
+                return False
+            shared_score = incumbent.value
+            if shared_score >= upper_bound:
+                return True  # un autre processus a atteint la borne : inutile de continuer
+            if since_improvement >= sync_every and best_score < shared_score:
+                pruned = True  # départ enlisé et en retard sur le meilleur score partagé
+                return True
+            return False
+        
+        remaining = None if deadline is None else max(deadline - time.perf_counter(), 0)
+        for solution, score in tabu_search_iter(vms, pms, seed=run_seed, time_limit=remaining, strategy=run_strategy,
+                                                stop=stop, upper_bound=upper_bound, **params):
+            if stats['initial_score'] is None:
+                stats['initial_score'] = score
+            if score > stats['best_score']:
+                best_solution = solution
+                stats['best_score'] = score
+                stats['improvements'] += 1
+                _publish(incumbent, score)
+        
+        if not pruned or stats['restarts'] >= max_restarts:
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        # Redémarrage depuis un ordre aléatoire, avec une graine propre à ce processus et à ce redémarrage
+        stats['restarts'] += 1
+        run_strategy, run_seed = 'random', seed + 7919 * stats['restarts']
+    
+    stats['elapsed'] = time.perf_counter() - started
+    return best_solution, stats
+
+def default_starts(count, seed=0):
+    # Départs variés : les stratégies de placement initial alternent, chaque départ a sa graine
+    return [(INITIAL_STRATEGIES[k % len(INITIAL_STRATEGIES)], seed + k) for k in range(count)]
+
+def multi_start_search(vms, pms, starts=None, workers=None, time_limit=None, sync_every=10, max_restarts=3, seed=0, **params):
+    # Lance une recherche taboue par départ dans un pool de processus. Les processus partagent le meilleur
+    # score trouvé pour s'arrêter (borne atteinte) ou abandonner un départ en retard et redémarrer.
+    # Renvoie (meilleure solution, VMs non placées, score, statistiques par départ).
+    # Les tables compactes sont converties une fois, avant d'être transmises aux processus
+    vms, pms = as_vms(vms), as_pms(pms)
+    if starts is None:
+        starts = default_starts(workers or os.cpu_count() or 1, seed)
+    # Le calcul de la borne est décompté du budget des départs
+    began = time.perf_counter()
+    upper_bound = placement_upper_bound(vms, pms, None if time_limit is None else began + time_limit)
+    if time_limit is not None:
+        time_limit = max(time_limit - (time.perf_counter() - began), 0)
+    incumbent = multiprocessing.Value('q', -1)
+    
+    with worker_pool(workers or len(starts), incumbent=incumbent) as executor:
+        futures = [executor.submit(worker_task(_run_start), k, vms, pms, strategy, start_seed, upper_bound, time_limit, sync_every, max_restarts, params)
+                   for k, (strategy, start_seed) in enumerate(starts)]
+        outcomes = [future.result() for future in futures]
+    
+    # Égalité : le premier départ l'emporte, pour un résultat reproductible
+    best_solution, _ = max(outcomes, key=lambda outcome: outcome[1]['best_score'])
+    worker_stats = [stats for _, stats in outcomes]
+    return best_solution, best_solution.unplaced_vms(), best_solution.score(), worker_stats
@@ -0,0 +1,500 @@
+import heapq
+
+try:
+    import numpy as np
+except ImportError:  # moteur vectorisé indisponible : repli sur les profils par PM
+    np = None
+
+HORIZON = 1440
+
+class MaxAddTree:
+    # Arbre de segments itératif : ajout sur un intervalle, maximum sur un intervalle
+    def __init__(self, size):
+        self.n = size
+        self.h = size.bit_length()
+        self.t = [0] * (2 * size)
+        self.d = [0] * size
+
+    def _apply(self, p, value):
+        self.t[p] += value
+        if p < self.n:
+            self.d[p] += value
+
+    def _build(self, p):
+        t, d = self.t, self.d
+        while p > 1:
+            p >>= 1
+            t[p] = max(t[2 * p], t[2 * p + 1]) + d[p]
+
+    def _push(self, p):
+        d = self.d
+        for s in range(self.h, 0, -1):
+            i = p >> s
+            if i > 0 and d[i]:
+                self._apply(2 * i, d[i])
+                self._apply(2 * i + 1, d[i])
+                d[i] = 0
+
+    def add(self, left, right, value):
+        left += self.n
+        right += self.n
+        l0, r0 = left, right
+        while left < right:
+            if left & 1:
+                self._apply(left, value)
+                left += 1
+            if right & 1:
+                right -= 1
+                self._apply(right, value)
+            left >>= 1
+            right >>= 1
+        self._build(l0)
+        self._build(r0 - 1)
+
+    def max(self, left, right):
+        left += self.n
+        right += self.n
+        self._push(left)
+        self._push(right - 1)
+        t = self.t
+        result = 0
+        while left < right:
+            if left & 1:
+                result = max(result, t[left])
+                left += 1
+            if right & 1:
+                right -= 1
+                result = max(result, t[right])
+            left >>= 1
+            right >>= 1
+        return result
+
+class CapacityProfile:
+    # Occupation d'une PM minute par minute sur [0, HORIZON) : pic CPU/RAM/stockage en O(log T)
+    def __init__(self, pm, horizon=HORIZON):
+        self.pm = pm
+        self.horizon = horizon
+        self.trees = [MaxAddTree(horizon) for _ in range(3)]
+
+    def _window(self, start, end):
+        return max(start, 0), min(end, self.horizon)
+
+    def add(self, vm, sign=1):
+        start, end = self._window(vm[4], vm[5])
+        if start >= end:
+            return
+        for tree, demand in zip(self.trees, vm[1:4]):
+            tree.add(start, end, sign * demand)
+
+    def remove(self, vm):
+        self.add(vm, sign=-1)
+
+    def peak(self, start, end):
+        start, end = self._window(start, end)
+        if start >= end:
+            return 0, 0, 0
+        return tuple(tree.max(start, end) for tree in self.trees)
+
+    def fits(self, vm):
+        pm = self.pm
+        if vm[1] > pm[1] or vm[2] > pm[2] or vm[3] > pm[3]:
+            return False
+        cpu, ram, storage = self.peak(vm[4], vm[5])
+        return cpu + vm[1] <= pm[1] and ram + vm[2] <= pm[2] and storage + vm[3] <= pm[3]
+
+class ProfileOccupancy:
+    # Occupation de la flotte en Python pur : un CapacityProfile par PM
+    def __init__(self, pms, horizon=HORIZON):
+        self.pms = pms
+        self.profiles = [CapacityProfile(pm, horizon) for pm in pms]
+
+    def add(self, i, vm):
+        self.profiles[i].add(vm)
+
+    def remove(self, i, vm):
+        self.profiles[i].remove(vm)
+
+    def add_many(self, indices, vms):
+        for i, vm in zip(indices, vms):
+            self.add(i, vm)
+
+    def peak(self, i, start, end):
+        return self.profiles[i].peak(start, end)
+
+    def fits(self, i, vm):
+        return self.profiles[i].fits(vm)
+
+    def fits_without(self, i, vm, removed):
+        # La VM tiendrait-elle sur la PM i si les VMs « removed » en partaient ?
+        profile = self.profiles[i]
+        for other in removed:
+            profile.remove(other)
+        fits = profile.fits(vm)
+        for other in removed:
+            profile.add(other)
+        return fits
+
+    def fits_many(self, i, vms):
+        return [self.profiles[i].fits(vm) for vm in vms]
+
+    def first_fit(self, vm):
+        for i, profile in enumerate(self.profiles):
+            if profile.fits(vm):
+                return i
+        return -1
+
+    def best_fit(self, vm):
+        # PM faisable laissant le moins de marge (normalisée) sur la fenêtre de la VM
+        return self._fit_by_slack(vm, 1)
+
+    def worst_fit(self, vm):
+        # PM faisable laissant le plus de marge : la charge est étalée sur la flotte
+        return self._fit_by_slack(vm, -1)
+
+    def _fit_by_slack(self, vm, sign):
+        best, best_slack = -1, None
+        for i, profile in enumerate(self.profiles):
+            pm = profile.pm
+            peak = profile.peak(vm[4], vm[5])
+            remaining = [capacity - used - demand for capacity, used, demand in zip(pm[1:4], peak, vm[1:4])]
+            if min(remaining) < 0:
+                continue
+            slack = sign * sum(r / capacity for r, capacity in zip(remaining, pm[1:4]) if capacity > 0)
+            if best_slack is None or slack < best_slack:
+                best, best_slack = i, slack
+        return best
+
+    def feasible_mask(self, vm):
+        return [profile.fits(vm) for profile in self.profiles]
+
+    def deficits(self, vm):
+        # Ressources manquantes sur chaque PM où la VM ne tient pas (mais tiendrait sur la PM vide)
+        result = []
+        for i, profile in enumerate(self.profiles):
+            pm = profile.pm
+            if vm[1] > pm[1] or vm[2] > pm[2] or vm[3] > pm[3]:
+                continue
+            peak = profile.peak(vm[4], vm[5])
+            missing = tuple(used + demand - capacity for used, demand, capacity in zip(peak, vm[1:4], pm[1:4]))
+            if max(missing) > 0:
+                result.append((i, missing))
+        return result
+
+    def feasible_matrix(self, vms):
+        return [self.feasible_mask(vm) for vm in vms]
+
+class FleetOccupancy:
+    # Occupation de toute la flotte dans un tableau NumPy (n_pms, n_buckets, 3).
+    # Avec bucket > 1 minute, une VM réserve chaque tranche qu'elle touche (approximation prudente).
+    BLOCK = 32
+
+    def __init__(self, pms, horizon=HORIZON, bucket=1):
+        self.pms = pms
+        self.bucket = bucket
+        self.n_buckets = -(-horizon // bucket)
+        self.n_blocks = -(-self.n_buckets // self.BLOCK)
+        self.capacity = np.array([pm[1:4] for pm in pms], dtype=np.int64).reshape(len(pms), 3)
+        # Une tranche vide en fin de tableau pour que reduceat accepte l'indice de fin
+        self.usage = np.zeros((len(pms), self.n_blocks * self.BLOCK + 1, 3), dtype=np.int64)
+        self.block_max = np.zeros((len(pms), self.n_blocks, 3), dtype=np.int64)
+
+    def _buckets(self, start, end):
+        start = min(max(start, 0) // self.bucket, self.n_buckets)
+        end = min(max(-(-end // self.bucket), start), self.n_buckets)
+        return start, end
+
+    def _update(self, i, vm, sign):
+        start, end = self._buckets(vm[4], vm[5])
+        if start >= end:
+            return
+        self.usage[i, start:end] += sign * np.asarray(vm[1:4], dtype=np.int64)
+        first = start // self.BLOCK
+        last = -(-end // self.BLOCK)
+        blocks = self.usage[i, first * self.BLOCK:last * self.BLOCK]
+        self.block_max[i, first:last] = blocks.reshape(-1, self.BLOCK, 3).max(axis=1)
+
+    def add(self, i, vm):
+        self._update(i, vm, 1)
+
+    def remove(self, i, vm):
+        self._update(i, vm, -1)
+
+    def add_many(self, indices, vms):
+        # Chargement groupé d'affectations connues : différences cumulées par PM, un seul recalcul des maxima par bloc
+        if not len(vms):
+            return
+        windows = np.array([self._buckets(vm[4], vm[5]) for vm in vms], dtype=np.int64).reshape(-1, 2)
+        demand = np.array([vm[1:4] for vm in vms], dtype=np.int64).reshape(-1, 3)
+        indices = np.asarray(indices, dtype=np.int64)
+        keep = windows[:, 0] < windows[:, 1]
+        diff = np.zeros_like(self.usage)
+        np.add.at(diff, (indices[keep], windows[keep, 0]), demand[keep])
+        np.add.at(diff, (indices[keep], windows[keep, 1]), -demand[keep])
+        self.usage += np.cumsum(diff, axis=1)
+        size = self.n_blocks * self.BLOCK
+        self.block_max = self.usage[:, :size].reshape(len(self.pms), self.n_blocks, self.BLOCK, 3).max(axis=2)
+
+    def _window_max(self, start, end):
+        # Pic de toute la flotte sur [start, end) : bords tranche par tranche, milieu par blocs
+        block = self.BLOCK
+        first = -(-start // block)
+        last = end // block
+        if last - first < 2:
+            return self.usage[:, start:end].max(axis=1)
+        peak = self.block_max[:, first:last].max(axis=1)
+        if start < first * block:
+            peak = np.maximum(peak, self.usage[:, start:first * block].max(axis=1))
+        if last * block < end:
+            peak = np.maximum(peak, self.usage[:, last * block:end].max(axis=1))
+        return peak
+
+    def peak(self, i, start, end):
+        start, end = self._buckets(start, end)
+        if start >= end:
+            return 0, 0, 0
+        return tuple(int(v) for v in self.usage[i, start:end].max(axis=0))
+
+    def fits(self, i, vm):
+        demand = np.asarray(vm[1:4], dtype=np.int64)
+        start, end = self._buckets(vm[4], vm[5])
+        if start >= end:
+            return bool((demand <= self.capacity[i]).all())
+        return bool((self.usage[i, start:end].max(axis=0) + demand <= self.capacity[i]).all())
+
+    def fits_many(self, i, vms):
+        # Faisabilité de plusieurs VMs sur la PM i : table creuse des maxima de la PM (maximum de chaque
+        # intervalle de 2^k tranches), puis une requête en O(1) par VM sur deux intervalles couvrant sa fenêtre
+        if not len(vms):
+            return []
+        windows = np.array([self._buckets(vm[4], vm[5]) for vm in vms], dtype=np.int64).reshape(-1, 2)
+        demand = np.array([vm[1:4] for vm in vms], dtype=np.int64).reshape(-1, 3)
+        start, end = windows[:, 0], windows[:, 1]
+        table = [self.usage[i, :self.n_buckets]]
+        while 2 ** len(table) <= self.n_buckets:
+            half = 2 ** (len(table) - 1)
+            table.append(np.maximum(table[-1][:-half], table[-1][half:]))
+        level = np.log2(np.maximum(end - start, 1)).astype(np.int64)
+        peak = np.zeros_like(demand)
+        for k in np.unique(level[start < end]).tolist():
+            rows = np.flatnonzero((level == k) & (start < end))
+            peak[rows] = np.maximum(table[k][start[rows]], table[k][end[rows] - 2 ** k])
+        return (peak + demand <= self.capacity[i]).all(axis=1).tolist()
+
+    def feasible_mask(self, vm):
+        demand = np.asarray(vm[1:4], dtype=np.int64)
+        start, end = self._buckets(vm[4], vm[5])
+        if start >= end:
+            peak = 0
+        else:
+            peak = self._window_max(start, end)
+        return (peak + demand <= self.capacity).all(axis=1)
+
+    def fits_without(self, i, vm, removed):
+        # La VM tiendrait-elle sur la PM i si les VMs « removed » en partaient ? (sans modifier l'état)
+        demand = np.asarray(vm[1:4], dtype=np.int64)
+        start, end = self._buckets(vm[4], vm[5])
+        if start >= end:
+            return bool((demand <= self.capacity[i]).all())
+        window = self.usage[i, start:end].copy()
+        for other in removed:
+            other_start, other_end = self._buckets(other[4], other[5])
+            other_start, other_end = max(other_start, start), min(other_end, end)
+            if other_start < other_end:
+                window[other_start - start:other_end - start] -= np.asarray(other[1:4], dtype=np.int64)
+        return bool((window.max(axis=0) + demand <= self.capacity[i]).all())
+
+    def deficits(self, vm):
+        # Ressources manquantes sur chaque PM où la VM ne tient pas (mais tiendrait sur la PM vide)
+        demand = np.asarray(vm[1:4], dtype=np.int64)
+        start, end = self._buckets(vm[4], vm[5])
+        if start >= end:
+            return []
+        missing = self._window_max(start, end) + demand - self.capacity
+        mask = (missing > 0).any(axis=1) & (demand <= self.capacity).all(axis=1)
+        return [(i, tuple(missing[i].tolist())) for i in np.flatnonzero(mask).tolist()]
+
+    def first_fit(self, vm):
+        mask = self.feasible_mask(vm)
+        i = int(mask.argmax())
+        return i if mask[i] else -1
+
+    def best_fit(self, vm):
+        # PM faisable laissant le moins de marge (normalisée) sur la fenêtre de la VM
+        slack = self._slack(vm, np.inf)
+        return -1 if slack is None else int(slack.argmin())
+
+    def worst_fit(self, vm):
+        # PM faisable laissant le plus de marge : la charge est étalée sur la flotte
+        slack = self._slack(vm, -np.inf)
+        return -1 if slack is None else int(slack.argmax())
+
+    def _slack(self, vm, infeasible):
+        # Marge normalisée de chaque PM après ajout de la VM (`infeasible` si elle n'y tient pas), None si aucune ne convient
+        demand = np.asarray(vm[1:4], dtype=np.int64)
+        start, end = self._buckets(vm[4], vm[5])
+        remaining = self.capacity - demand
+        if start < end:
+            remaining = remaining - self._window_max(start, end)
+        mask = (remaining >= 0).all(axis=1)
+        if not mask.any():
+            return None
+        slack = (remaining / np.maximum(self.capacity, 1)).sum(axis=1)
+        slack[~mask] = infeasible
+        return slack
+
+    def feasible_matrix(self, vms, chunk=1024):
+        # Masque (n_vms, n_pms) pour un lot de VMs, évalué contre l'état courant de la flotte
+        result = np.zeros((len(vms), len(self.pms)), dtype=bool)
+        for offset in range(0, len(vms), chunk):
+            batch = vms[offset:offset + chunk]
+            windows = np.array([self._buckets(vm[4], vm[5]) for vm in batch], dtype=np.int64).reshape(-1, 2)
+            demand = np.array([vm[1:4] for vm in batch], dtype=np.int64).reshape(-1, 3)
+            peak = np.maximum.reduceat(self.usage, windows.ravel(), axis=1)[:, ::2]
+            peak[:, windows[:, 0] >= windows[:, 1]] = 0
+            fits = (peak + demand[np.newaxis] <= self.capacity[:, np.newaxis]).all(axis=2)
+            result[offset:offset + len(batch)] = fits.T
+        return result
+
+class HeadroomIndex:
+    # Marge de chaque PM pour un placement glouton par ordre d'arrivée sur une flotte vide. Toutes les VMs déjà
+    # placées arrivent au plus tard à l'arrivée de la VM courante : sur sa fenêtre, la charge d'une PM ne fait
+    # que décroître, son pic est la charge à l'instant d'arrivée. Le test de faisabilité se réduit donc à
+    # comparer la demande à la marge courante, mise à jour au fil des départs (tas).
+    # Les PMs sont regroupées par blocs de BLOCK avec la marge maximale du bloc pour chaque ressource :
+    # un bloc dont une marge maximale est inférieure à la demande est sauté sans examiner ses PMs.
+    # Avec NumPy, une copie des marges en tableau sert aux règles 'best' et 'worst', qui comparent toutes les PMs.
+    BLOCK = 64
+
+    def __init__(self, pms, horizon=HORIZON):
+        self.pms = pms
+        self.horizon = horizon
+        self.capacity = [tuple(pm[1:4]) for pm in pms]
+        self.headroom = [list(capacity) for capacity in self.capacity]
+        self.blocks = [range(first, min(first + self.BLOCK, len(pms))) for first in range(0, len(pms), self.BLOCK)]
+        self.block_max = [self._block_max(block) for block in self.blocks]
+        self.capacity_max = [list(block_max) for block_max in self.block_max]
+        if np is not None:
+            self.full = np.array(self.capacity, dtype=np.int64).reshape(len(pms), 3)
+            self.free = self.full.copy()
+            self.scale = np.maximum(self.full, 1)
+        else:
+            self.free = None
+        self.departures = []  # tas (départ, PM, demande)
+        self.now = 0
+
+    def _block_max(self, block):
+        headroom = self.headroom
+        return [max(headroom[i][r] for i in block) for r in range(3)]
+
+    def _window(self, vm):
+        # Même découpage que l'occupation : fenêtre ramenée à [0, horizon)
+        start = min(max(vm[4], 0), self.horizon)
+        return start, min(max(vm[5], start), self.horizon)
+
+    def advance(self, now):
+        # Rend la marge des VMs parties à `now` (intervalles semi-ouverts : un départ à now libère la place)
+        if now < self.now:
+            raise ValueError(f"Le balayage doit suivre l'ordre d'arrivée ({now} < {self.now})")
+        self.now = now
+        departures = self.departures
+        changed = set()
+        while departures and departures[0][0] <= now:
+            _, i, demand = heapq.heappop(departures)
+            headroom = self.headroom[i]
+            for r in range(3):
+                headroom[r] += demand[r]
+            if self.free is not None:
+                self.free[i] = headroom
+            changed.add(i // self.BLOCK)
+        for b in changed:
+            self.block_max[b] = self._block_max(self.blocks[b])
+
+    def add(self, i, vm):
+        start, end = self._window(vm)
+        if start >= end:
+            return
+        demand = tuple(vm[1:4])
+        headroom = self.headroom[i]
+        for r in range(3):
+            headroom[r] -= demand[r]
+        if self.free is not None:
+            self.free[i] = headroom
+        heapq.heappush(self.departures, (end, i, demand))
+        b = i // self.BLOCK
+        self.block_max[b] = self._block_max(self.blocks[b])
+
+    def choose(self, vm, rule='first'):
+        # PM retenue pour la VM selon la règle ('first' : première faisable, 'best' : moins de marge normalisée
+        # restante, 'worst' : le plus de marge), -1 si aucune ne convient. Mêmes choix que first_fit, best_fit
+        # et worst_fit de l'occupation, sans parcourir la fenêtre de temps.
+        cpu, ram, storage = vm[1], vm[2], vm[3]
+        start, end = self._window(vm)
+        if start < end:
+            self.advance(start)
+            headroom, block_max = self.headroom, self.block_max
+        else:
+            headroom, block_max = self.capacity, self.capacity_max  # fenêtre vide : seule la capacité compte
+        if rule != 'first' and self.free is not None:
+            # Même calcul que FleetOccupancy._slack, sur les marges à l'instant d'arrivée
+            remaining = (self.free if start < end else self.full) - np.asarray(vm[1:4], dtype=np.int64)
+            mask = (remaining >= 0).all(axis=1)
+            if not mask.any():
+                return -1
+            slack = (remaining / self.scale).sum(axis=1)
+            if rule == 'worst':
+                slack[~mask] = -np.inf
+                return int(slack.argmax())
+            slack[~mask] = np.inf
+            return int(slack.argmin())
+
+        best, best_slack = -1, None
+        sign = -1 if rule == 'worst' else 1
+        for block, (max_cpu, max_ram, max_storage) in zip(self.blocks, block_max):
+            if cpu > max_cpu or ram > max_ram or storage > max_storage:
+                continue
+            for i in block:
+                free = headroom[i]
+                if cpu > free[0] or ram > free[1] or storage > free[2]:
+                    continue
+                if rule == 'first':
+                    return i
+                slack = sign * sum((f - d) / capacity for f, d, capacity in zip(free, (cpu, ram, storage), self.capacity[i]) if capacity > 0)
+                if best_slack is None or slack < best_slack:
+                    best, best_slack = i, slack
+        return best
+
+def make_occupancy(pms, horizon=HORIZON, vectorized=True):
+    if vectorized and np is not None:
+        return FleetOccupancy(pms, horizon)
+    return ProfileOccupancy(pms, horizon)
+
+def mask_indices(mask):
+    if np is not None and isinstance(mask, np.ndarray):
+        return np.flatnonzero(mask).tolist()
+    return [i for i, ok in enumerate(mask) if ok]
+
+def is_feasible(pm, vm, assigned_vms):
+    # Version de référence : pic de concurrence exact sur [arrivée, départ).
+    # pm, vm et assigned_vms sont des lignes de table (PMTable/VMTable) ou des listes de l'ancien format.
+    events = []
+    for assigned_vm in assigned_vms:
+        start = max(assigned_vm[4], vm[4])
+        end = min(assigned_vm[5], vm[5])
+        if start < end:
+            events.append((start, 1, assigned_vm))
+            events.append((end, -1, assigned_vm))
+    
+    # Les départs passent avant les arrivées au même instant (intervalles semi-ouverts)
+    events.sort(key=lambda e: (e[0], e[1]))
+    
+    current_cpu = current_ram = current_storage = 0
+    peak_cpu = peak_ram = peak_storage = 0
+    for _, sign, assigned_vm in events:
+        current_cpu += sign * assigned_vm[1]
+        current_ram += sign * assigned_vm[2]
+        current_storage += sign * assigned_vm[3]
+        peak_cpu = max(peak_cpu, current_cpu)
+        peak_ram = max(peak_ram, current_ram)
+        peak_storage = max(peak_storage, current_storage)
+    
+    return pm[1] - peak_cpu >= vm[1] and pm[2] - peak_ram >= vm[2] and pm[3] - peak_storage >= vm[3]
@@ -0,0 +1,221 @@
+import argparse
+import heapq
+import socketserver
+import sys
+import threading
+
+from .model import VMTable, as_pms
+from .occupancy import HORIZON, make_occupancy
+from .scenarios import read_table
+from .search import tabu_search
+
+# Stratégie d'admission -> méthode de l'occupation qui choisit la PM
+PLACEMENT_RULES = {'arrival': 'first_fit', 'best_fit': 'best_fit', 'worst_fit': 'worst_fit'}
+
+class OnlinePlacer:
+    # Admission des réservations au fil de l'eau. submit() place une VM contre l'occupation incrémentale
+    # de la flotte ('arrival' : première PM faisable, 'best_fit' : PM la plus juste, 'worst_fit' : la plus libre)
+    # ou la rejette ; advance() fait avancer l'horloge et libère les VMs parties. Les méthodes sont protégées par un verrou :
+    # le placeur peut être partagé entre les connexions d'un serveur et un thread de ré-optimisation.
+    def __init__(self, pms, strategy='arrival', horizon=HORIZON, vectorized=True):
+        if strategy not in PLACEMENT_RULES:
+            raise ValueError(f"Stratégie de placement initial inconnue : {strategy}")
+        self.pms = as_pms(pms)
+        self.horizon = horizon
+        self.vectorized = vectorized
+        self.occupancy = make_occupancy(self.pms, horizon, vectorized)
+        self.choose = getattr(self.occupancy, PLACEMENT_RULES[strategy])
+        self.now = 0
+        self.active = {}  # nom -> [vm, indice de PM], réservations acceptées et non libérées
+        self.departures = []  # tas (départ, nom) ; les entrées des VMs déjà libérées sont ignorées
+        self.version = 0
+        self.lock = threading.RLock()
+        self.stats = {'submitted': 0, 'accepted': 0, 'rejected': 0, 'released': 0, 'expired': 0, 'reoptimized': 0}
+        self._reoptimizer = None
+        self._stop_reoptimizer = threading.Event()
+
+    def submit(self, vm):
+        # Renvoie le nom de la PM retenue, ou None si la réservation est rejetée.
+        # La partie déjà écoulée d'une réservation ([arrivée, now)) n'est pas réservée.
+        with self.lock:
+            if vm[0] in self.active:
+                raise ValueError(f"Réservation déjà active : {vm[0]}")
+            self.stats['submitted'] += 1
+            vm = [vm[0], vm[1], vm[2], vm[3], max(vm[4], self.now), vm[5]]
+            i = self.choose(vm) if vm[5] > self.now else -1
+            if i < 0:
+                self.stats['rejected'] += 1
+                return None
+            self.occupancy.add(i, vm)
+            self.active[vm[0]] = [vm, i]
+            heapq.heappush(self.departures, (vm[5], vm[0]))
+            self.version += 1
+            self.stats['accepted'] += 1
+            return self.pms.names[i]
+
+    def _free(self, name):
+        vm, i = self.active.pop(name)
+        self.occupancy.remove(i, vm)
+        self.version += 1
+
+    def release(self, name):
+        # Libération anticipée (annulation) ; False si la réservation est inconnue
+        with self.lock:
+            if name not in self.active:
+                return False
+            self._free(name)
+            self.stats['released'] += 1
+            return True
+
+    def advance(self, now):
+        # Avance l'horloge et libère les VMs dont le départ est passé ; renvoie leurs noms
+        with self.lock:
+            if now < self.now:
+                raise ValueError(f"L'horloge ne peut pas reculer ({now} < {self.now})")
+            self.now = now
+            expired = []
+            while self.departures and self.departures[0][0] <= now:
+                departure, name = heapq.heappop(self.departures)
+                entry = self.active.get(name)
+                if entry is not None and entry[0][5] == departure:
+                    self._free(name)
+                    expired.append(name)
+            self.stats['expired'] += len(expired)
+            return expired
+
+    def location(self, name):
+        entry = self.active.get(name)
+        return None if entry is None else self.pms.names[entry[1]]
+
+    def run(self, vms, advance=True):
+        # Traite un itérable (liste, générateur, lecteur de fichier) de réservations et produit (vm, PM ou None).
+        # Avec advance, l'horloge suit l'arrivée de chaque demande.
+        for vm in vms:
+            if advance and vm[4] > self.now:
+                self.advance(vm[4])
+            yield vm, self.submit(vm)
+
+    def reoptimize(self, iterations=50, strategy='best_fit', **params):
+        # Ré-optimisation taboue des réservations futures (pas encore commencées) : les VMs en cours restent
+        # en place, les futures sont replacées au plus serré. Le nouveau plan n'est adopté que s'il garde
+        # toutes les réservations, occupe moins de PMs et qu'aucune demande n'a modifié l'état entre-temps.
+        with self.lock:
+            version = self.version
+            now = self.now
+            started = [entry for entry in self.active.values() if entry[0][4] <= now]
+            future = [entry for entry in self.active.values() if entry[0][4] > now]
+        if not future:
+            return False
+
+        # La recherche travaille sur une copie : les admissions continuent pendant ce temps
+        occupancy = make_occupancy(self.pms, self.horizon, self.vectorized)
+        for vm, i in started:
+            occupancy.add(i, vm)
+        vms = VMTable.from_lists([vm for vm, _ in future])
+        best_solution, _, best_score = tabu_search(vms, self.pms, iterations=iterations, strategy=strategy, occupancy=occupancy, **params)
+        if best_score < len(future):
+            return False
+
+        current = {vm[0]: i for vm, i in started + future}
+        planned = {vm[0]: i for vm, i in started}
+        planned.update((vms.names[vm_id], best_solution.location[vm_id]) for vm_id in range(len(vms)))
+        if len(set(planned.values())) >= len(set(current.values())):
+            return False
+
+        with self.lock:
+            if self.version != version or self.now != now:
+                return False
+            for vm, i in future:
+                self.occupancy.remove(i, vm)
+            for entry in future:
+                entry[1] = planned[entry[0][0]]
+                self.occupancy.add(entry[1], entry[0])
+            self.version += 1
+            self.stats['reoptimized'] += 1
+            return True
+
+    def start_reoptimizer(self, interval=1.0, **params):
+        # Ré-optimisation périodique dans un thread d'arrière-plan
+        def loop():
+            while not self._stop_reoptimizer.wait(interval):
+                self.reoptimize(**params)
+
+        self._stop_reoptimizer.clear()
+        self._reoptimizer = threading.Thread(target=loop, daemon=True)
+        self._reoptimizer.start()
+
+    def stop_reoptimizer(self):
+        if self._reoptimizer is not None:
+            self._stop_reoptimizer.set()
+            self._reoptimizer.join()
+            self._reoptimizer = None
+
+def handle_line(placer, line):
+    # Protocole texte, une commande par ligne :
+    #   « NOM cpu ram stockage arrivée départ » -> « NOM PM_k » ou « NOM REJECT »
+    #   « release NOM » -> « NOM RELEASED » ou « NOM UNKNOWN »
+    #   « advance T » -> « EXPIRED nom1 nom2 ... »
+    # line : chaîne ou octets UTF-8 (socket) ; une ligne mal formée donne une réponse « ERROR ... »
+    try:
+        if isinstance(line, bytes):
+            line = line.decode()
+        parts = line.split()
+        if not parts:
+            return None
+        if parts[0] == 'release' and len(parts) == 2:
+            return f"{parts[1]} {'RELEASED' if placer.release(parts[1]) else 'UNKNOWN'}"
+        if parts[0] == 'advance' and len(parts) == 2:
+            return " ".join(["EXPIRED", *placer.advance(int(parts[1]))])
+        if len(parts) == 6:
+            vm = [parts[0], *map(int, parts[1:])]
+            return f"{vm[0]} {placer.submit(vm) or 'REJECT'}"
+        return f"ERROR commande inconnue : {line.strip()}"
+    except ValueError as error:
+        return f"ERROR {error}"
+
+def serve_lines(placer, lines, output):
+    # Entrée depuis un tube, un fichier ou tout itérable de lignes ; une réponse par commande
+    for line in lines:
+        reply = handle_line(placer, line)
+        if reply is not None:
+            output.write(reply + "\n")
+            output.flush()
+
+def serve_socket(placer, port, host="127.0.0.1"):
+    # Serveur TCP local : chaque connexion parle le protocole de handle_line, toutes partagent le placeur
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                reply = handle_line(placer, line)
+                if reply is not None:
+                    self.wfile.write((reply + "\n").encode())
+
+    server = socketserver.ThreadingTCPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m vmplacement.online", description="Admission de réservations de VMs au fil de l'eau")
+    parser.add_argument("pm_file", help="fichier des machines physiques (.txt ou .npy)")
+    parser.add_argument("--port", type=int, default=None, help="écoute sur 127.0.0.1:PORT (défaut : entrée standard)")
+    parser.add_argument("--strategy", choices=sorted(PLACEMENT_RULES), default="arrival")
+    parser.add_argument("--reoptimize", type=float, default=None, help="ré-optimise les réservations futures toutes les N secondes")
+    args = parser.parse_args(argv)
+
+    placer = OnlinePlacer(read_table(args.pm_file, is_vm=False), strategy=args.strategy)
+    if args.reoptimize is not None:
+        placer.start_reoptimizer(args.reoptimize)
+    try:
+        if args.port is None:
+            serve_lines(placer, sys.stdin, sys.stdout)
+        else:
+            with serve_socket(placer, args.port) as server:
+                server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        placer.stop_reoptimizer()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
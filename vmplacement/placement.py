@@ -0,0 +1,78 @@
+from array import array
+
+class Placement:
+    # Index bidirectionnel VM -> PM et PM -> VMs sur les identifiants entiers des tables, plus l'ensemble
+    # explicite des VMs non placées. location[vm] vaut l'indice de la PM, ou -1 si la VM n'est pas placée.
+    # Les ensembles sont des dict (ordre d'insertion conservé pour des rapports déterministes).
+    def __init__(self, pms, vms, occupancy=None, order=None):
+        self.pms = pms
+        self.vms = vms
+        self.occupancy = occupancy
+        self.location = array('i', [-1]) * len(vms)
+        self.pm_vms = [{} for _ in range(len(pms))]
+        self.unplaced = dict.fromkeys(range(len(vms)) if order is None else order)
+        self.placed = 0
+
+    def assign(self, vm_id, pm_id):
+        if self.location[vm_id] >= 0:
+            self.unassign(vm_id)
+        del self.unplaced[vm_id]
+        self.location[vm_id] = pm_id
+        self.pm_vms[pm_id][vm_id] = None
+        self.placed += 1
+        if self.occupancy is not None:
+            self.occupancy.add(pm_id, self.vms[vm_id])
+
+    def unassign(self, vm_id):
+        pm_id = self.location[vm_id]
+        self.location[vm_id] = -1
+        del self.pm_vms[pm_id][vm_id]
+        self.unplaced[vm_id] = None
+        self.placed -= 1
+        if self.occupancy is not None:
+            self.occupancy.remove(pm_id, self.vms[vm_id])
+
+    def move(self, vm_id, pm_id):
+        if pm_id is None:
+            self.unassign(vm_id)
+        else:
+            self.assign(vm_id, pm_id)
+
+    def pm_of(self, vm_id):
+        pm_id = self.location[vm_id]
+        return pm_id if pm_id >= 0 else None
+
+    def is_placed(self, vm_id):
+        return self.location[vm_id] >= 0
+
+    def vms_on(self, pm_id):
+        vms = self.vms
+        return [vms[vm_id] for vm_id in self.pm_vms[pm_id]]
+
+    def unplaced_vms(self):
+        vms = self.vms
+        return [vms[vm_id] for vm_id in self.unplaced]
+
+    def unplaced_names(self):
+        names = self.vms.names
+        return [names[vm_id] for vm_id in self.unplaced]
+
+    def score(self):
+        return self.placed
+
+    def copy(self):
+        # Instantané sans occupation : sert à conserver la meilleure solution
+        clone = Placement.__new__(Placement)
+        clone.pms = self.pms
+        clone.vms = self.vms
+        clone.occupancy = None
+        clone.location = array('i', self.location)
+        clone.pm_vms = [dict(vm_ids) for vm_ids in self.pm_vms]
+        clone.unplaced = dict(self.unplaced)
+        clone.placed = self.placed
+        return clone
+
+    def as_dict(self):
+        # Ancien format {nom_pm: [vm, ...]}, VMs en listes nommées
+        names = self.vms.names
+        return {self.pms.names[pm_id]: [[names[vm[0]], *vm[1:]] for vm in self.vms_on(pm_id)] for pm_id in range(len(self.pm_vms))}
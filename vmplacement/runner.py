@@ -0,0 +1,137 @@
+from concurrent.futures import as_completed
+
+from .decompose import decomposed_search
+from .model import as_pms, as_vms
+from .multistart import multi_start_search
+from .occupancy import np
+from .scenarios import list_scenario_files, pm_file, read_table
+from .search import tabu_search
+from .stats import SolverStats
+from .usage import average_usage, calculate_resource_usage, fleet_report, usage_metrics
+from .workers import worker_pool, worker_task
+
+def solve_scenario(vms, pms, scenario=None, starts=None, decompose=False, stop=None, profile=False, **params):
+    # Résout un scénario et renvoie un résumé sérialisable (JSON/CSV).
+    # Avec starts=N, N recherches partent en parallèle de placements initiaux différents
+    # (stop, le crochet d'avancement/annulation, ne s'applique alors pas).
+    # Avec decompose, chaque bloc de VMs sans recouvrement temporel avec les autres est résolu séparément.
+    # Avec profile, le résumé contient les compteurs, temps par phase et trace de la recherche (clé 'stats') ;
+    # seule la recherche directe est instrumentée (ni multi-départs ni décomposition).
+    vms, pms = as_vms(vms), as_pms(pms)
+    total_vms = len(vms)
+    stats = SolverStats() if profile and not (decompose or starts) else None
+    if decompose:
+        best_solution, unplaced_vms, best_score = decomposed_search(vms, pms, stop=stop, **params)
+    elif starts:
+        best_solution, unplaced_vms, best_score, _ = multi_start_search(vms, pms, workers=starts, **params)
+    else:
+        best_solution, unplaced_vms, best_score = tabu_search(vms, pms, stop=stop, stats=stats, **params)
+    metrics = usage_metrics(best_solution) if np is not None else None
+    resource_usage = calculate_resource_usage(best_solution, pms, metrics)
+    avg_cpu, avg_ram, avg_storage = average_usage(resource_usage)
+    rejected_vms = len(best_solution.unplaced)
+    
+    result = {
+        'scenario': scenario,
+        'total_vms': total_vms,
+        'placed': best_score,
+        'rejected': rejected_vms,
+        'rejection_rate': (rejected_vms / total_vms) * 100 if total_vms > 0 else 0,
+        'avg_cpu': avg_cpu,
+        'avg_ram': avg_ram,
+        'avg_storage': avg_storage,
+        'unplaced': [vms.names[vm[0]] for vm in unplaced_vms],
+        'resource_usage': resource_usage,
+    }
+    result.update(fleet_report(metrics))
+    if stats is not None:
+        result['stats'] = stats.as_dict()
+    return result
+
+def progress_hook(scenario, iterations, events=None, cancel=None):
+    # Crochet stop() de la recherche : publie ('progress', scenario, itération, itérations, score)
+    # dans la file `events` et interrompt la recherche dès que l'événement `cancel` est positionné
+    count = 0
+    
+    def stop(best_score, since_improvement):
+        nonlocal count
+        count += 1
+        if events is not None:
+            events.put(('progress', scenario, count, iterations, best_score))
+        return cancel is not None and cancel.is_set()
+    
+    return stop
+
+def _solve_file(num, vm_file, params, pms, events=None, cancel=None):
+    vms = read_table(vm_file, is_vm=True)
+    stop = progress_hook(num, params.get('iterations', 100), events, cancel)
+    return solve_scenario(vms, pms, scenario=num, stop=stop, **params)
+
+def solve_files(pms, vm_files, workers=1, events=None, cancel=None, cache=None, **params):
+    # vm_files : [(numéro, chemin .txt ou .npy)]. Avec workers != 1, les scénarios sont résolus dans un pool de processus
+    # (None = tous les cœurs) et les résultats sont produits au fil de l'eau, dans l'ordre de fin de calcul.
+    # Le solveur n'utilise que des générateurs aléatoires initialisés par `seed` : le résultat d'un scénario
+    # ne dépend pas du processus qui l'a calculé (hors time_limit).
+    # events (multiprocessing.Queue) reçoit l'avancement ; cancel (multiprocessing.Event) interrompt les recherches.
+    # cache (ResultCache) : les scénarios déjà résolus avec les mêmes données et paramètres sont relus sans calcul,
+    # seuls les autres sont soumis au solveur ; un calcul annulé n'est pas mis en cache.
+    # Avec profile, tout est recalculé pour mesurer chaque recherche : le cache n'est alors qu'alimenté.
+    pms = as_pms(pms)
+    keys = {}
+    if cache is not None:
+        misses = []
+        for num, vm_file in vm_files:
+            key = cache.key(read_table(vm_file, is_vm=True), pms, params)
+            result = None if params.get('profile') else cache.get(key)
+            if result is None:
+                keys[num] = key
+                misses.append((num, vm_file))
+            else:
+                result['scenario'] = num
+                result['cached'] = True
+                yield result
+        vm_files = misses
+    
+    for result in _solve_all(pms, vm_files, workers, events, cancel, params):
+        if result['scenario'] in keys and not (cancel is not None and cancel.is_set()):
+            cache.put(keys[result['scenario']], result)
+        yield result
+
+def _solve_all(pms, vm_files, workers, events, cancel, params):
+    if workers == 1:
+        for num, vm_file in vm_files:
+            if cancel is not None and cancel.is_set():
+                return
+            yield _solve_file(num, vm_file, params, pms, events, cancel)
+        return
+    
+    executor = worker_pool(workers, pms=pms, events=events, cancel=cancel)
+    try:
+        futures = [executor.submit(worker_task(_solve_file), num, vm_file, params) for num, vm_file in vm_files]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # Abandon anticipé (générateur fermé) : les scénarios non démarrés sont annulés sans attendre
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def solve_folder(folder=".", workers=1, cache=None, **params):
+    # Résout chaque machines_virtuelles_N.txt du dossier
+    pms = read_table(pm_file(folder), is_vm=False)
+    yield from solve_files(pms, list_scenario_files(folder), workers, cache=cache, **params)
+
+def sorted_results(results):
+    # Ordre déterministe du rapport agrégé, quel que soit l'ordre de fin de calcul
+    return sorted(results, key=lambda result: result['scenario'])
+
+def global_summary(results):
+    # Moyennes sur l'ensemble des scénarios
+    if not results:
+        return None
+    count = len(results)
+    return {
+        'scenarios': count,
+        'avg_rejection_rate': sum(result['rejection_rate'] for result in results) / count,
+        'avg_cpu': sum(result['avg_cpu'] for result in results) / count,
+        'avg_ram': sum(result['avg_ram'] for result in results) / count,
+        'avg_storage': sum(result['avg_storage'] for result in results) / count,
+    }
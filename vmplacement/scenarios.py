@@ -0,0 +1,80 @@
+import os
+import random
+import re
+
+from .model import PMTable, VMTable
+
+PM_FILENAME = "machines_physiques.txt"
+SCENARIO_PATTERN = re.compile(r'machines_virtuelles_(\d+)\.(txt|npy)')
+
+def generate_machines(n_physiques, vm_min, vm_max, step, n_scenarios, seed=None):
+    # seed : graine du tirage (None : non reproductible). Pour des millions de VMs, voir generator.py
+    rng = random.Random(seed)
+    machines_physiques = []
+    machines_virtuelles_list = [[] for _ in range(n_scenarios)]
+    
+    for i in range(n_physiques):
+        machines_physiques.append([f"PM_{i+1}", rng.randint(16, 32), rng.randint(32, 128), rng.randint(500, 1000)])
+    
+    for idx in range(n_scenarios):
+        n_virt = rng.randrange(vm_min, vm_max + 1, step)
+        for i in range(n_virt):
+            arrival = rng.randint(0, 1440)
+            departure = rng.randint(arrival, 1440)
+            machines_virtuelles_list[idx].append([f"VM_{idx+1}_{i+1}", rng.randint(1, 8), rng.randint(1, 32), rng.randint(10, 200), arrival, departure])
+    
+    return machines_physiques, machines_virtuelles_list
+
+def save_to_txt(filename, machines):
+    with open(filename, mode='w') as file:
+        for machine in machines:
+            file.write(" ".join(map(str, machine)) + "\n")
+
+def read_from_txt(filename, is_vm=False):
+    machines = []
+    with open(filename, mode='r') as file:
+        for line in file:
+            parts = line.strip().split()
+            if is_vm:
+                machines.append([parts[0], int(parts[1]), int(parts[2]), int(parts[3]), int(parts[4]), int(parts[5])])
+            else:
+                machines.append([parts[0], int(parts[1]), int(parts[2]), int(parts[3])])
+    return machines
+
+def newest(paths):
+    # Un .npy n'est retenu que s'il n'est pas plus ancien que le .txt dont il provient
+    binary = [path for path in paths if path.endswith(".npy")]
+    text = [path for path in paths if path.endswith(".txt")]
+    if binary and (not text or os.path.getmtime(binary[0]) >= os.path.getmtime(text[0])):
+        return binary[0]
+    return text[0]
+
+def list_scenario_files(folder="."):
+    # Fichiers machines_virtuelles_N (.txt ou .npy) du dossier, triés par numéro de scénario croissant
+    candidates = {}
+    for f in os.listdir(folder):
+        match = SCENARIO_PATTERN.fullmatch(f)
+        if match:
+            candidates.setdefault(int(match.group(1)), []).append(os.path.join(folder, f))
+    return sorted((num, newest(paths)) for num, paths in candidates.items())
+
+def pm_file(folder="."):
+    # machines_physiques.npy s'il est à jour, sinon machines_physiques.txt
+    text = os.path.join(folder, PM_FILENAME)
+    binary = os.path.splitext(text)[0] + ".npy"
+    return newest([path for path in (binary, text) if os.path.exists(path)] or [text])
+
+def read_machines(filename, is_vm=False):
+    # Lecture selon l'extension : format colonnes .npy (memory-map) ou texte historique
+    if filename.endswith(".npy"):
+        from .columnar import load_columnar, to_machines
+        return to_machines(*load_columnar(filename))
+    return read_from_txt(filename, is_vm)
+
+def read_table(filename, is_vm=False):
+    # Lecture directe au format compact (colonnes d'entiers + table des noms), .npy ou texte
+    table = VMTable if is_vm else PMTable
+    if filename.endswith(".npy"):
+        from .columnar import load_columnar
+        return table.from_records(*load_columnar(filename))
+    return table.from_lists(read_from_txt(filename, is_vm))
@@ -0,0 +1,417 @@
+import heapq
+import random
+import time
+from collections import deque
+
+from .model import as_pms, as_vms
+from .occupancy import HeadroomIndex, make_occupancy, mask_indices, np
+from .placement import Placement
+from .stats import TimedMoves
+
+INITIAL_STRATEGIES = ('arrival', 'largest', 'random', 'best_fit', 'worst_fit')
+# Règle de choix de la PM des stratégies par ordre d'arrivée
+SWEEP_RULES = {'arrival': 'first', 'best_fit': 'best', 'worst_fit': 'worst'}
+
+def initial_placement(vms, pms, occupancy=None, strategy='arrival', seed=0):
+    # Ordre de placement et choix de la PM selon la stratégie :
+    # 'arrival' (ordre d'arrivée, première PM faisable), 'largest' (plus grosse demande normalisée d'abord),
+    # 'random' (ordre aléatoire initialisé par seed), 'best_fit' (ordre d'arrivée, PM la plus juste),
+    # 'worst_fit' (ordre d'arrivée, PM la plus libre).
+    # L'ordre est une permutation des identifiants de VMs : les tables ne sont jamais modifiées.
+    # Par ordre d'arrivée sur une flotte vide, le choix passe par l'index des marges (HeadroomIndex) et
+    # l'occupation est chargée en bloc à la fin ; sinon chaque VM est testée contre l'occupation.
+    vms, pms = as_vms(vms), as_pms(pms)
+    
+    if strategy in SWEEP_RULES:
+        order = sorted(range(len(vms)), key=vms.column('arrival').__getitem__)
+    elif strategy == 'largest':
+        maxima = [max(column, default=0) or 1 for column in pms.columns]
+        cpu, ram, storage = vms.columns[:3]
+        order = sorted(range(len(vms)), key=lambda v: cpu[v] / maxima[0] + ram[v] / maxima[1] + storage[v] / maxima[2], reverse=True)
+    elif strategy == 'random':
+        order = list(range(len(vms)))
+        random.Random(seed).shuffle(order)
+    else:
+        raise ValueError(f"Stratégie de placement initial inconnue : {strategy}")
+    
+    if occupancy is None and strategy in SWEEP_RULES:
+        index = HeadroomIndex(pms)
+        rule = SWEEP_RULES[strategy]
+        placement = Placement(pms, vms, None, order)
+        for v in order:
+            vm = vms[v]
+            i = index.choose(vm, rule)
+            if i >= 0:
+                index.add(i, vm)
+                placement.assign(v, i)
+        occupancy = make_occupancy(pms)
+        assigned = [v for v in order if placement.location[v] >= 0]
+        occupancy.add_many([placement.location[v] for v in assigned], [vms[v] for v in assigned])
+        placement.occupancy = occupancy
+        return placement, placement.unplaced_vms()
+    
+    if occupancy is None:
+        occupancy = make_occupancy(pms)
+    choose = {'best_fit': occupancy.best_fit, 'worst_fit': occupancy.worst_fit}.get(strategy, occupancy.first_fit)
+    placement = Placement(pms, vms, occupancy, order)
+    
+    for v in order:
+        i = choose(vms[v])
+        if i >= 0:
+            placement.assign(v, i)
+    
+    return placement, placement.unplaced_vms()
+
+def evaluate(placement):
+    return placement.score()
+
+class ZobristTable:
+    # Clés 64 bits par couple (VM, PM) : l'empreinte d'une solution est le XOR de ses affectations
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self.keys = {}
+
+    def __getitem__(self, key):
+        value = self.keys.get(key)
+        if value is None:
+            value = self.keys[key] = self.rng.getrandbits(64)
+        return value
+
+    def move_key(self, move):
+        vm_id, source, target = move
+        key = 0
+        if source is not None:
+            key ^= self[vm_id, source]
+        if target is not None:
+            key ^= self[vm_id, target]
+        return key
+
+class TabuList:
+    # Liste taboue bornée : file FIFO pour l'éviction, ensemble pour un test d'appartenance en O(1)
+    def __init__(self, size):
+        self.size = size
+        self.order = deque()
+        self.members = set()
+
+    def add(self, key):
+        if key in self.members or self.size <= 0:
+            return
+        self.order.append(key)
+        self.members.add(key)
+        if len(self.order) > self.size:
+            self.members.discard(self.order.popleft())
+
+    def __contains__(self, key):
+        return key in self.members
+
+def freed_gain(freed, deficit, pm):
+    # Part du déficit d'une PM comblée par un mouvement, normalisée par sa capacité
+    return sum(min(max(f, 0), max(d, 0)) / capacity for f, d, capacity in zip(freed, deficit, pm[1:4]) if capacity > 0)
+
+def neighborhood(placement, candidates, pm_limit=4, blocker_limit=2, swap_limit=2, eject_limit=16, diversify_limit=16):
+    # Génère paresseusement des mouvements (delta, gain, étapes) ; chaque étape est (vm, pm_source, pm_cible),
+    # en identifiants entiers (pm_source/pm_cible à None pour une VM non placée).
+    # Les mouvements améliorants (insertion, chaîne d'éjection) sortent en premier.
+    # eject_limit et diversify_limit bornent les tests de faisabilité tentés (aboutis ou non) par les chaînes
+    # d'éjection et par la diversification : le coût d'une itération ne dépend pas du nombre d'échecs.
+    occupancy = placement.occupancy
+    pms, vms = placement.pms, placement.vms
+    location = placement.location
+    cpu, ram, storage, arrival, departure = vms.columns
+    
+    # Insertion d'une VM non placée : +1
+    for vm, mask in zip(candidates, occupancy.feasible_matrix(candidates)):
+        for i in mask_indices(mask):
+            yield 1, 0.0, [(vm[0], None, i)]
+    
+    # PMs les plus proches d'accueillir chaque VM non placée, calculées à la demande
+    promising = []
+    
+    def closest(k):
+        if k == len(promising):
+            vm = candidates[k]
+            deficits = occupancy.deficits(vm)
+            deficits.sort(key=lambda item: freed_gain(item[1], item[1], pms[item[0]]))
+            promising.append((vm, deficits[:pm_limit]))
+        return promising[k]
+    
+    # Première PM d'accueil de chaque VM bloquante hors de sa PM (-1 : aucune), le temps d'une itération
+    relocations = {}
+    
+    def relocation(blocker_id):
+        if blocker_id not in relocations:
+            source = location[blocker_id]
+            relocations[blocker_id] = next((j for j in mask_indices(occupancy.feasible_mask(vms[blocker_id])) if j != source), -1)
+        return relocations[blocker_id]
+    
+    # Chaîne d'éjection : une VM bloquante part ailleurs et libère la place : +1
+    attempts = eject_limit
+    for k in range(len(candidates)):
+        if attempts <= 0:
+            break
+        vm, deficits = closest(k)
+        for i, deficit in deficits:
+            for b in placement.pm_vms[i]:
+                if attempts <= 0:
+                    break
+                if not (arrival[b] < vm[5] and vm[4] < departure[b]) or cpu[b] < deficit[0] or ram[b] < deficit[1] or storage[b] < deficit[2]:
+                    continue
+                blocker = vms[b]
+                attempts -= 1
+                if not occupancy.fits_without(i, vm, [blocker]):
+                    continue
+                if b not in relocations:
+                    attempts -= 1
+                j = relocation(b)
+                if j >= 0:
+                    yield 1, 0.0, [(b, i, j), (vm[0], None, i)]
+    
+    # Diversification à delta nul, guidée par la part du déficit libérée
+    attempts = diversify_limit
+    for k in range(len(candidates)):
+        vm, deficits = closest(k)
+        for i, deficit in deficits:
+            if attempts <= 0:
+                return
+            pm = pms[i]
+            overlapping = (b for b in placement.pm_vms[i] if arrival[b] < vm[5] and vm[4] < departure[b])
+            for b in heapq.nlargest(blocker_limit, overlapping, key=lambda b: freed_gain((cpu[b], ram[b], storage[b]), deficit, pm)):
+                if attempts <= 0:
+                    return
+                blocker = vms[b]
+                
+                # Relocalisation de la VM bloquante
+                if b not in relocations:
+                    attempts -= 1
+                j = relocation(b)
+                if j >= 0:
+                    yield 0, freed_gain(blocker[1:4], deficit, pm), [(b, i, j)]
+                    continue
+                
+                # Sinon, échange avec la première VM plus petite des swap_limit PMs suivantes qui en portent une
+                # (au plus pm_limit * swap_limit PMs parcourues)
+                tried = 0
+                for step in range(1, min(len(pms), 1 + pm_limit * swap_limit)):
+                    if tried >= swap_limit or attempts <= 0:
+                        break
+                    j = (i + step) % len(pms)
+                    other_id = next((o for o in placement.pm_vms[j] if cpu[o] <= blocker[1] and ram[o] <= blocker[2] and storage[o] <= blocker[3]
+                                     and (cpu[o], ram[o], storage[o]) != blocker[1:4]), None)
+                    if other_id is None:
+                        continue
+                    other = vms[other_id]
+                    tried += 1
+                    attempts -= 1
+                    if occupancy.fits_without(j, blocker, [other]) and occupancy.fits_without(i, other, [blocker]):
+                        freed = [mine - theirs for mine, theirs in zip(blocker[1:4], other[1:4])]
+                        yield 0, freed_gain(freed, deficit, pm), [(b, i, j), (other_id, j, i)]
+
+def placement_upper_bound(vms, pms, deadline=None):
+    # Borne supérieure du nombre de VMs plaçables. Une VM plus grande que toute PM vide n'est jamais placée ;
+    # à chaque instant t, au plus k_t VMs actives tiennent dans la capacité cumulée de la flotte
+    # (les k_t plus petites demandes), donc au moins |actives(t)| - k_t VMs sont rejetées.
+    # deadline (time.perf_counter) : les instants restants sont ignorés une fois l'échéance passée,
+    # la borne reste valide mais moins serrée.
+    vms, pms = as_vms(vms), as_pms(pms)
+    placeable = [vm for vm in vms if any(vm[1] <= pm[1] and vm[2] <= pm[2] and vm[3] <= pm[3] for pm in pms)]
+    totals = [sum(pm[r] for pm in pms) for r in (1, 2, 3)]
+    instants = sorted({vm[4] for vm in placeable if vm[4] < vm[5]})
+    forced_rejections = 0
+    
+    if np is not None and placeable:
+        arrival = np.array([vm[4] for vm in placeable])
+        departure = np.array([vm[5] for vm in placeable])
+        demand = np.array([vm[1:4] for vm in placeable], dtype=np.int64)
+        for t in instants:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            active = demand[(arrival <= t) & (t < departure)]
+            if len(active) <= forced_rejections or (active.sum(axis=0) <= totals).all():
+                continue
+            cumulative = np.cumsum(np.sort(active, axis=0), axis=0)
+            fitting = min(int(np.searchsorted(cumulative[:, r], totals[r], side='right')) for r in range(3))
+            forced_rejections = max(forced_rejections, len(active) - fitting)
+    else:
+        for t in instants:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            active = [vm for vm in placeable if vm[4] <= t < vm[5]]
+            if len(active) <= forced_rejections:
+                continue
+            fitting = len(active)
+            for r in (1, 2, 3):
+                used = count = 0
+                for value in sorted(vm[r] for vm in active):
+                    used += value
+                    if used > totals[r - 1]:
+                        break
+                    count += 1
+                fitting = min(fitting, count)
+            forced_rejections = max(forced_rejections, len(active) - fitting)
+    
+    return len(placeable) - forced_rejections
+
+def tabu_search_iter(vms, pms, iterations=100, tabu_size=10, seed=0, neighborhood_size=32, time_limit=None, stagnation=None, strategy='arrival', stop=None, upper_bound=None, occupancy=None, start=None, candidates=None, stats=None, trace=None):
+    # Recherche « anytime » : produit (meilleure solution, score) au départ puis à chaque amélioration.
+    # Arrêt sur budget (itérations, secondes), stagnation, absence de voisin ou optimalité prouvée,
+    # ou lorsque stop(meilleur_score, itérations_sans_amélioration) renvoie True.
+    # occupancy : occupation de départ (VMs déjà en place, jamais déplacées), complétée par la recherche.
+    # start : placement de départ (avec son occupation), utilisé à la place du placement initial.
+    # candidates : identifiants des seules VMs que la recherche tente d'insérer (par défaut, toutes les non placées).
+    # stats (SolverStats) : compteurs et temps par phase ; trace(entrée) est appelé après chaque itération
+    # avec {iteration, score, best_score, neighbors, tabu_rejected, unplaced, elapsed}.
+    clock = time.perf_counter
+    began = clock()
+    deadline = None if time_limit is None else began + time_limit
+    rng = random.Random(seed)
+    vms, pms = as_vms(vms), as_pms(pms)
+    accounted = sum(stats.timers.values()) if stats is not None else 0.0
+    if start is None:
+        current, _ = initial_placement(vms, pms, occupancy, strategy=strategy, seed=seed)
+        if stats is not None:
+            stats.add_time("tabu_search;initial_placement", clock() - began)
+    else:
+        current = start
+    if stats is not None:
+        # Les tests de faisabilité comptés sont ceux de la recherche, pas ceux du placement initial
+        current.occupancy = stats.counting(current.occupancy)
+    try:
+        yield from _tabu_loop(current, vms, pms, iterations, tabu_size, rng, seed, neighborhood_size, deadline, stagnation, stop, upper_bound, candidates, stats, trace, began)
+    finally:
+        if stats is not None:
+            # Temps propre de la recherche (contrôle de la boucle, trace) : le reste est compté dans les sous-phases
+            stats.add_time("tabu_search", clock() - began - (sum(stats.timers.values()) - accounted))
+            # Le placement de départ de l'appelant retrouve son occupation d'origine
+            if start is not None:
+                start.occupancy = start.occupancy.occupancy
+
+def _tabu_loop(current, vms, pms, iterations, tabu_size, rng, seed, neighborhood_size, deadline, stagnation, stop, upper_bound, allowed, stats, trace, began):
+    clock = time.perf_counter
+    observed = stats is not None or trace is not None
+    zobrist = ZobristTable(seed)
+    fingerprint = 0
+    for pm_id, vm_ids in enumerate(current.pm_vms):
+        for vm_id in vm_ids:
+            fingerprint ^= zobrist[vm_id, pm_id]
+    tabu_list = TabuList(tabu_size)
+    tabu_list.add(fingerprint)
+    
+    score = evaluate(current)
+    best_solution = current.copy()
+    best_score = score
+    yield best_solution, best_score
+    
+    if upper_bound is None:
+        started = clock()
+        if deadline is not None and started >= deadline:
+            upper_bound = len(vms)  # budget épuisé par le placement initial : pas d'itération, borne inutile
+        else:
+            upper_bound = placement_upper_bound(vms, pms, deadline)
+        if stats is not None:
+            stats.add_time("tabu_search;upper_bound", clock() - started)
+    iteration = 0
+    since_improvement = 0
+    
+    while best_score < upper_bound and (iterations is None or iteration < iterations):
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        if stagnation is not None and since_improvement >= stagnation:
+            break
+        if stop is not None and stop(best_score, since_improvement):
+            break
+        iteration += 1
+        best_move = None
+        if observed:
+            started = clock()
+        
+        if allowed is None:
+            pool = list(current.unplaced)
+        else:
+            pool = [vm_id for vm_id in allowed if current.location[vm_id] < 0]
+        sampled = len(pool) > neighborhood_size
+        if sampled:
+            pool = rng.sample(pool, neighborhood_size)
+        candidates = [vms[vm_id] for vm_id in pool]
+        
+        moves = neighborhood(current, candidates)
+        if stats is not None:
+            moves = TimedMoves(moves, clock)
+            listed = clock()
+        examined = rejected = 0
+        for examined, (delta, gain, steps) in enumerate(moves, start=1):
+            if deadline is not None and clock() >= deadline:
+                break  # échéance en cours d'itération : le meilleur mouvement déjà vu est appliqué
+            new_fingerprint = fingerprint
+            for step in steps:
+                new_fingerprint ^= zobrist.move_key(step)
+            # Critère d'aspiration : un mouvement tabou est accepté s'il bat la meilleure solution
+            if new_fingerprint in tabu_list and score + delta <= best_score:
+                rejected += 1
+                continue
+            if best_move is None or (delta, gain) > best_move[:2]:
+                best_move = (delta, gain, steps, new_fingerprint)
+                if delta > 0:
+                    break  # aucun mouvement ne place plus d'une VM à la fois
+        if stats is not None:
+            # Génération : tirage des candidats et production des voisins ; évaluation : empreintes, test tabou, choix
+            evaluated = clock()
+            stats.add_time("tabu_search;iteration;neighbors", listed - started + moves.elapsed)
+            stats.add_time("tabu_search;iteration;evaluation", evaluated - listed - moves.elapsed)
+            stats.counters['iterations'] += 1
+            stats.counters['neighbors'] += examined
+            stats.counters['tabu_rejected'] += rejected
+        
+        if best_move is None:
+            if observed:
+                _observe(stats, trace, iteration, score, best_score, examined, rejected, current, clock() - began)
+            if not sampled:
+                break  # aucun voisin admissible : la recherche ne peut plus progresser
+            since_improvement += 1
+            continue
+        
+        delta, _, steps, fingerprint = best_move
+        for vm_id, _, target in steps:
+            current.move(vm_id, target)
+        score += delta
+        if stats is not None:
+            applied = clock()
+            stats.add_time("tabu_search;iteration;apply", applied - evaluated)
+        tabu_list.add(fingerprint)
+        if stats is not None:
+            stats.add_time("tabu_search;iteration;tabu", clock() - applied)
+            stats.counters['moves'] += 1
+            stats.counters['vm_moves'] += len(steps)
+        
+        # La meilleure solution n'est recopiée que lorsqu'elle s'améliore
+        if score > best_score:
+            if stats is not None:
+                copied = clock()
+            best_solution = current.copy()
+            best_score = score
+            since_improvement = 0
+            if stats is not None:
+                stats.add_time("tabu_search;iteration;snapshot", clock() - copied)
+                stats.counters['improvements'] += 1
+            if observed:
+                _observe(stats, trace, iteration, score, best_score, examined, rejected, current, clock() - began)
+            yield best_solution, best_score
+        else:
+            since_improvement += 1
+            if observed:
+                _observe(stats, trace, iteration, score, best_score, examined, rejected, current, clock() - began)
+
+def _observe(stats, trace, iteration, score, best_score, examined, rejected, current, elapsed):
+    entry = {'iteration': iteration, 'score': score, 'best_score': best_score, 'neighbors': examined,
+             'tabu_rejected': rejected, 'unplaced': len(current.unplaced), 'elapsed': elapsed}
+    if stats is not None:
+        stats.record(entry)
+    if trace is not None:
+        trace(entry)
+
+def tabu_search(vms, pms, iterations=100, tabu_size=10, seed=0, neighborhood_size=32, time_limit=None, stagnation=None, strategy='arrival', callback=None, stop=None, occupancy=None, stats=None, trace=None):
+    # callback(meilleure_solution, score) est appelé à chaque amélioration ; stats et trace : voir tabu_search_iter
+    for best_solution, best_score in tabu_search_iter(vms, pms, iterations, tabu_size, seed, neighborhood_size, time_limit, stagnation, strategy, stop, occupancy=occupancy, stats=stats, trace=trace):
+        if callback is not None:
+            callback(best_solution, best_score)
+    
+    return best_solution, best_solution.unplaced_vms(), best_score
@@ -0,0 +1,83 @@
+import json
+import time
+from collections import Counter
+
+# Tests de faisabilité de l'occupation comptés par CountingOccupancy (une PM ou toute la flotte par appel)
+FEASIBILITY_CALLS = ('fits', 'fits_many', 'fits_without', 'feasible_mask', 'feasible_matrix', 'deficits', 'first_fit', 'best_fit', 'worst_fit')
+
+class SolverStats:
+    # Compteurs, chronomètres par phase et trace par itération d'une résolution, remplis par tabu_search(stats=...).
+    # Sans objet stats (stats=None, le défaut), la recherche ne mesure rien : elle ne teste stats qu'une fois par
+    # itération et l'occupation n'est pas enveloppée.
+    # Les temps sont des temps propres, indexés par chemin de phase « tabu_search;iteration;neighbors ».
+    def __init__(self, keep_trace=True, clock=time.perf_counter):
+        self.clock = clock
+        self.counters = Counter()
+        self.timers = {}
+        self.trace = [] if keep_trace else None
+
+    def add_time(self, path, seconds):
+        self.timers[path] = self.timers.get(path, 0.0) + seconds
+
+    def counting(self, occupancy):
+        return CountingOccupancy(occupancy, self.counters)
+
+    def record(self, entry):
+        if self.trace is not None:
+            self.trace.append(entry)
+
+    def as_dict(self):
+        return {
+            'counters': dict(self.counters),
+            'timers': dict(self.timers),
+            'trace': self.trace if self.trace is not None else [],
+        }
+
+    def to_json(self, file=None):
+        if file is None:
+            return json.dumps(self.as_dict())
+        json.dump(self.as_dict(), file, indent=2)
+
+    def collapsed(self, prefix=None):
+        return collapsed_stacks(self.timers, prefix)
+
+def collapsed_stacks(timers, prefix=None):
+    # Format « piles repliées » (flamegraph.pl, speedscope, inferno) : une ligne « a;b;c microsecondes » par phase,
+    # préfixée par exemple du scénario pour empiler plusieurs résolutions dans un même profil
+    head = "" if prefix is None else f"{prefix};"
+    return "\n".join(f"{head}{path} {round(seconds * 1e6)}" for path, seconds in sorted(timers.items()) if seconds > 0)
+
+class CountingOccupancy:
+    # Enveloppe une occupation et compte chaque appel à un test de faisabilité (« occupancy.fits », ...)
+    def __init__(self, occupancy, counters):
+        self.occupancy = occupancy
+        for name in FEASIBILITY_CALLS:
+            method = getattr(occupancy, name, None)
+            if method is not None:
+                setattr(self, name, _counted(method, counters, f"occupancy.{name}"))
+
+    def __getattr__(self, name):
+        return getattr(self.occupancy, name)
+
+class TimedMoves:
+    # Itérateur de voisins chronométré : elapsed cumule le temps passé à produire les voisins
+    def __init__(self, moves, clock=time.perf_counter):
+        self.moves = moves
+        self.clock = clock
+        self.elapsed = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        started = self.clock()
+        try:
+            return next(self.moves)
+        finally:
+            self.elapsed += self.clock() - started
+
+def _counted(method, counters, key):
+    def call(*args, **kwargs):
+        counters[key] += 1
+        return method(*args, **kwargs)
+    return call
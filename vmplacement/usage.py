@@ -0,0 +1,183 @@
+from .model import as_pms
+from .occupancy import HORIZON, np
+
+RESOURCES = ('cpu', 'ram', 'storage')
+
+def usage_timeline(placement, pm_ids=None, horizon=HORIZON):
+    # Occupation minute par minute d'un groupe de PMs, tableau (3, len(pm_ids), horizon) : une matrice
+    # PM × minute par ressource, le temps étant l'axe contigu. Différences aux arrivées et aux départs
+    # (np.bincount sur des indices aplatis), puis somme cumulée le long du temps.
+    pm_ids = list(range(len(placement.pms)) if pm_ids is None else pm_ids)
+    owners = []
+    vm_ids = []
+    for k, i in enumerate(pm_ids):
+        hosted = placement.pm_vms[i]
+        owners.extend([k] * len(hosted))
+        vm_ids.extend(hosted)
+    owners = np.array(owners, dtype=np.int64)
+    vm_ids = np.array(vm_ids, dtype=np.int64)
+    
+    columns = [np.frombuffer(column, dtype=np.intc)[vm_ids] for column in placement.vms.columns]
+    start = np.clip(columns[3], 0, horizon)
+    end = np.clip(columns[4], 0, horizon)
+    keep = start < end
+    width = horizon + 1
+    cells = len(pm_ids) * width
+    index = np.concatenate([owners[keep] * width + start[keep], owners[keep] * width + end[keep]])
+    
+    diff = np.empty((3, len(pm_ids), width), dtype=np.int64)
+    for r in range(3):
+        demand = columns[r][keep].astype(np.int64)
+        diff[r] = np.bincount(index, weights=np.concatenate([demand, -demand]), minlength=cells).reshape(len(pm_ids), width)
+    return np.cumsum(diff[:, :, :horizon], axis=2)
+
+def percent(used, capacity):
+    return 100 * used / np.maximum(capacity, 1)
+
+def usage_metrics(placement, horizon=HORIZON, bucket=15, chunk=256):
+    # Indicateurs de toute la flotte, calculés par paquets de `chunk` PMs pour borner la mémoire :
+    # - peak (n, 3) : pic d'occupation ; active (n,) : minutes où la PM héberge au moins une VM ;
+    # - mean (n, 3) : moyenne (%) sur ces minutes actives ; twa (n, 3) : moyenne (%) pondérée par le temps sur l'horizon ;
+    # - utilization (3,) : occupation moyenne (%) de la capacité totale de la flotte ;
+    # - fragmentation (3,) : part moyenne (%) de la capacité libre qui n'est pas sur la PM la plus libre ;
+    # - timeline (n_tranches, 3) : occupation (%) de la flotte par tranche de `bucket` minutes.
+    n = len(placement.pms)
+    capacity = np.array([pm[1:4] for pm in placement.pms], dtype=np.int64).reshape(n, 3)
+    peak = np.zeros((n, 3), dtype=np.int64)
+    total = np.zeros((n, 3), dtype=np.int64)
+    active = np.zeros(n, dtype=np.int64)
+    fleet = np.zeros((3, horizon), dtype=np.int64)
+    largest_free = np.zeros((3, horizon), dtype=np.int64)
+    
+    for offset in range(0, n, chunk):
+        block = slice(offset, min(offset + chunk, n))
+        usage = usage_timeline(placement, range(block.start, block.stop), horizon)
+        if horizon:
+            peak[block] = usage.max(axis=2).T
+        total[block] = usage.sum(axis=2).T
+        active[block] = usage.any(axis=0).sum(axis=1)
+        fleet += usage.sum(axis=1)
+        free = capacity[block].T[:, :, np.newaxis] - usage
+        largest_free = np.maximum(largest_free, free.max(axis=1, initial=0))
+    
+    free = capacity.sum(axis=0)[:, np.newaxis] - fleet
+    fragmentation = np.where(free > 0, 1 - largest_free / np.maximum(free, 1), 0)
+    padded = np.zeros((3, -(-horizon // bucket) * bucket))
+    padded[:, :horizon] = fleet
+    return {
+        'peak': peak,
+        'active': active,
+        'mean': percent(total / np.maximum(active, 1)[:, np.newaxis], capacity),
+        'twa': percent(total / max(horizon, 1), capacity),
+        'utilization': percent(fleet.sum(axis=1) / max(horizon, 1), capacity.sum(axis=0)),
+        'fragmentation': 100 * fragmentation.mean(axis=1) if horizon else np.zeros(3),
+        'bucket': bucket,
+        'timeline': percent(padded.reshape(3, -1, bucket).mean(axis=2).T, capacity.sum(axis=0)),
+    }
+
+def fleet_report(metrics):
+    # Partie sérialisable (JSON) des indicateurs de flotte, None sans NumPy
+    if metrics is None:
+        return {'utilization': None, 'fragmentation': None, 'timeline': None}
+    timeline = {'bucket': metrics['bucket']}
+    timeline.update((resource, metrics['timeline'][:, r].tolist()) for r, resource in enumerate(RESOURCES))
+    return {
+        'utilization': dict(zip(RESOURCES, metrics['utilization'].tolist())),
+        'fragmentation': dict(zip(RESOURCES, metrics['fragmentation'].tolist())),
+        'timeline': timeline,
+    }
+
+def calculate_resource_usage(placement, pms, metrics=None):
+    # Rapport par nom de PM ; les lignes de table portent l'identifiant entier, les noms viennent des tables.
+    # Calcul vectorisé sur toute la flotte (usage_metrics), ou balayage d'événements par PM sans NumPy.
+    pms = as_pms(pms)
+    if metrics is None and np is not None:
+        metrics = usage_metrics(placement)
+    if metrics is None:
+        return _sweep_usage(placement, pms)
+    
+    vm_names = placement.vms.names
+    resource_usage = {}
+    for pm in pms:
+        i = pm[0]
+        usage = {}
+        for r, resource in enumerate(RESOURCES):
+            capacity = pm[r + 1]
+            used = int(metrics['peak'][i, r])
+            usage[resource] = min(used / capacity * 100, 100) if capacity > 0 else 0
+            usage[f'max_{resource}'] = capacity
+            usage[f'used_{resource}'] = used
+            usage[f'mean_{resource}'] = float(metrics['mean'][i, r])
+            usage[f'twa_{resource}'] = float(metrics['twa'][i, r])
+        usage['vms'] = [vm_names[vm_id] for vm_id in placement.pm_vms[i]]
+        usage['active_minutes'] = int(metrics['active'][i])
+        resource_usage[pms.names[i]] = usage
+    
+    return resource_usage
+
+def _sweep_usage(placement, pms):
+    vm_names = placement.vms.names
+    resource_usage = {}
+    for pm in pms:
+        pm_name = pms.names[pm[0]]
+        vms = placement.vms_on(pm[0])
+        
+        timeline = []
+        for vm in vms:
+            timeline.append((vm[4], 'start', vm[1], vm[2], vm[3]))
+            timeline.append((vm[5], 'end', vm[1], vm[2], vm[3]))
+        
+        # Les départs ('end') passent avant les arrivées au même instant (intervalles semi-ouverts)
+        timeline.sort(key=lambda x: (x[0], x[1]))
+        
+        max_cpu = pm[1]
+        max_ram = pm[2]
+        max_storage = pm[3]
+        
+        current_cpu = 0
+        current_ram = 0
+        current_storage = 0
+        max_observed_cpu = 0
+        max_observed_ram = 0
+        max_observed_storage = 0
+        
+        for event in timeline:
+            time, typ, cpu, ram, storage = event
+            if typ == 'start':
+                current_cpu += cpu
+                current_ram += ram
+                current_storage += storage
+            else:
+                current_cpu -= cpu
+                current_ram -= ram
+                current_storage -= storage
+            
+            max_observed_cpu = max(max_observed_cpu, current_cpu)
+            max_observed_ram = max(max_observed_ram, current_ram)
+            max_observed_storage = max(max_observed_storage, current_storage)
+        
+        cpu_percent = min((max_observed_cpu / max_cpu) * 100, 100) if max_cpu > 0 else 0
+        ram_percent = min((max_observed_ram / max_ram) * 100, 100) if max_ram > 0 else 0
+        storage_percent = min((max_observed_storage / max_storage) * 100, 100) if max_storage > 0 else 0
+        
+        resource_usage[pm_name] = {
+            'cpu': cpu_percent,
+            'ram': ram_percent,
+            'storage': storage_percent,
+            'vms': [vm_names[vm[0]] for vm in vms],
+            'max_cpu': max_cpu,
+            'max_ram': max_ram,
+            'max_storage': max_storage,
+            'used_cpu': max_observed_cpu,
+            'used_ram': max_observed_ram,
+            'used_storage': max_observed_storage
+        }
+    
+    return resource_usage
+
+def average_usage(resource_usage):
+    # Utilisation moyenne (%) CPU, RAM et stockage sur l'ensemble des PMs
+    usages = list(resource_usage.values())
+    if not usages:
+        return 0, 0, 0
+    return tuple(sum(usage[key] for usage in usages) / len(usages) for key in ('cpu', 'ram', 'storage'))
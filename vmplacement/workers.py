@@ -0,0 +1,23 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+# État partagé par les processus d'un pool (PMs, file d'événements, ...) : transmis une seule fois à chaque
+# processus par l'initialiseur plutôt qu'avec chaque tâche, puis passé en arguments nommés aux tâches.
+# Hors pool, les fonctions reçoivent le même état directement en arguments.
+_state = {}
+
+def _init_worker(state):
+    # Un processus créé par fork hérite de l'état du pool parent : seul celui de ce pool est conservé
+    _state.clear()
+    _state.update(state)
+
+def _call_with_state(function, *args):
+    return function(*args, **_state)
+
+def worker_pool(workers, **state):
+    # workers=None : tous les cœurs
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(state,))
+
+def worker_task(function):
+    # Tâche de pool : function(*args, **état du processus) ; function doit être définie au niveau d'un module
+    return partial(_call_with_state, function)